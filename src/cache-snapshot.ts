@@ -0,0 +1,74 @@
+import fs from "node:fs";
+
+import type { TTLCache } from "./cache.js";
+import { CACHE_SNAPSHOT_PATH } from "./config.js";
+
+// Expiry is stored as wall-clock time because the monotonic clock TTLCache uses restarts with the process.
+type SnapshotEntry = [key: string, value: unknown, expiresAtEpochMs: number];
+
+interface SnapshotSource {
+  entries(): Array<[string, unknown, number]>;
+}
+
+const persistentCaches = new Map<string, SnapshotSource>();
+let exitHookInstalled = false;
+
+function readSnapshot(path: string): Record<string, SnapshotEntry[]> {
+  try {
+    const parsed = JSON.parse(fs.readFileSync(path, "utf8")) as { version?: number; caches?: Record<string, SnapshotEntry[]> };
+    return parsed.version === 1 && parsed.caches ? parsed.caches : {};
+  } catch {
+    // A missing or unreadable snapshot only means a cold start.
+    return {};
+  }
+}
+
+function writeSnapshot(path: string): void {
+  const now = Date.now();
+  const caches: Record<string, SnapshotEntry[]> = {};
+  for (const [name, cache] of persistentCaches) {
+    caches[name] = cache.entries().map(([key, value, remainingMs]) => [key, value, now + remainingMs]);
+  }
+
+  // Write beside the target and rename, so a crash mid-write never leaves a truncated snapshot behind.
+  const tempPath = `${path}.tmp`;
+  fs.writeFileSync(tempPath, JSON.stringify({ version: 1, caches }));
+  fs.renameSync(tempPath, path);
+}
+
+// Writes every persisted cache to CACHE_SNAPSHOT_PATH now. This also runs on process exit, so entrypoints only need
+// to turn termination signals into a normal exit; embedders that stop without exiting can call it themselves.
+export function flushCacheSnapshots(): void {
+  if (!CACHE_SNAPSHOT_PATH || persistentCaches.size === 0) {
+    return;
+  }
+
+  try {
+    writeSnapshot(CACHE_SNAPSHOT_PATH);
+  } catch (error) {
+    console.error("Failed to write cache snapshot:", error);
+  }
+}
+
+// When CACHE_SNAPSHOT_PATH is set, the named cache is refilled from the snapshot left by the previous process
+// and written back, with its remaining TTLs, when this one exits. Without it this does nothing.
+export function persistCache<V>(name: string, cache: TTLCache<string, V>): void {
+  if (!CACHE_SNAPSHOT_PATH) {
+    return;
+  }
+
+  if (!exitHookInstalled) {
+    exitHookInstalled = true;
+    process.once("exit", flushCacheSnapshots);
+  }
+
+  // Only this cache's section is kept past the read, so restored values are not held twice and sections for
+  // caches this process never creates (such as those of disabled registries) can be collected straight away.
+  persistentCaches.set(name, cache);
+  const now = Date.now();
+  for (const [key, value, expiresAt] of readSnapshot(CACHE_SNAPSHOT_PATH)[name] ?? []) {
+    if (expiresAt > now) {
+      cache.set(key, value as V, (expiresAt - now) / 1000);
+    }
+  }
+}
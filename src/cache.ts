@@ -1,53 +1,224 @@
+import { CACHE_MAX_ITEMS } from "./config.js";
+import { SingleFlight } from "./lib/concurrency.js";
+import type { ToolResult } from "./types.js";
+
+const SKETCH_DEPTH = 4;
+const SKETCH_MAX_COUNT = 15;
+
+// Approximate access counts for TinyLFU admission: a count-min sketch of small saturating counters. Every
+// 10 * width increments all counters are halved, so keys that were popular long ago stop outranking new ones.
+class FrequencySketch {
+  private readonly counters: Uint8Array;
+  private readonly width: number;
+  private readonly sampleSize: number;
+  private additions = 0;
+
+  constructor(expectedItems: number) {
+    this.width = 2 ** Math.ceil(Math.log2(Math.max(expectedItems, 16)));
+    this.counters = new Uint8Array(this.width * SKETCH_DEPTH);
+    this.sampleSize = this.width * 10;
+  }
+
+  increment(key: unknown): void {
+    const mask = this.width - 1;
+    let hash = keyHash(key);
+    for (let row = 0; row < SKETCH_DEPTH; row++) {
+      hash = remix(hash);
+      const slot = row * this.width + (hash & mask);
+      const count = this.counters[slot] ?? SKETCH_MAX_COUNT;
+      if (count < SKETCH_MAX_COUNT) {
+        this.counters[slot] = count + 1;
+      }
+    }
+
+    this.additions += 1;
+    if (this.additions >= this.sampleSize) {
+      for (let index = 0; index < this.counters.length; index++) {
+        this.counters[index] = (this.counters[index] ?? 0) >> 1;
+      }
+      this.additions >>= 1;
+    }
+  }
+
+  estimate(key: unknown): number {
+    const mask = this.width - 1;
+    let hash = keyHash(key);
+    let estimate = SKETCH_MAX_COUNT;
+    for (let row = 0; row < SKETCH_DEPTH; row++) {
+      hash = remix(hash);
+      estimate = Math.min(estimate, this.counters[row * this.width + (hash & mask)] ?? 0);
+    }
+    return estimate;
+  }
+}
+
+// FNV-1a over the key's string form. Each sketch row remixes the previous row's hash so rows index independently;
+// the slots are computed inline because get() runs this on every cache hit and should not allocate.
+function keyHash(key: unknown): number {
+  const text = String(key);
+  let hash = 0x811c9dc5;
+  for (let index = 0; index < text.length; index++) {
+    hash = Math.imul(hash ^ text.charCodeAt(index), 0x01000193);
+  }
+  return hash;
+}
+
+function remix(hash: number): number {
+  const mixed = Math.imul(hash ^ (hash >>> 16), 0x45d9f3b);
+  return mixed ^ (mixed >>> 16);
+}
+
+// All methods are synchronous, so each call runs to completion without interleaving with other tool
+// handlers. Keep it that way: an await inside get/set would let concurrent requests observe half-updated state.
 export class TTLCache<K, V> {
   private readonly maxItems: number;
   private readonly ttlMs: number;
-  private readonly data = new Map<K, { timestamp: number; value: V }>();
+  private readonly maxBytes: number;
+  private readonly sizeOf: ((value: V) => number) | undefined;
+  private readonly data = new Map<K, { expiresAt: number; value: V; bytes: number }>();
+  private newestKey: K | undefined;
+  private totalBytes = 0;
+  private readonly sketch: FrequencySketch | undefined;
 
-  constructor(options: { maxItems?: number; ttlSeconds?: number } = {}) {
+  // With admission enabled, a new key only displaces the least recently used entry when it has been asked
+  // for at least as often, so a burst of one-off keys cannot flush the entries that keep getting hits.
+  // maxBytes bounds the summed sizeOf() of all values as well as the item count, for caches whose values
+  // range from a few hundred bytes to megabytes.
+  constructor(
+    options: {
+      maxItems?: number;
+      ttlSeconds?: number;
+      admission?: boolean;
+      maxBytes?: number;
+      sizeOf?: (value: V) => number;
+    } = {}
+  ) {
     this.maxItems = options.maxItems ?? 512;
     this.ttlMs = (options.ttlSeconds ?? 60) * 1000;
+    this.maxBytes = options.maxBytes ?? Number.POSITIVE_INFINITY;
+    this.sizeOf = options.sizeOf;
+    this.sketch = options.admission ? new FrequencySketch(this.maxItems) : undefined;
   }
 
   get(key: K): V | undefined {
+    this.sketch?.increment(key);
     const item = this.data.get(key);
     if (!item) {
       return undefined;
     }
 
-    if (performance.now() - item.timestamp > this.ttlMs) {
-      this.data.delete(key);
+    if (performance.now() > item.expiresAt) {
+      this.remove(key);
       return undefined;
     }
 
-    this.data.delete(key);
-    this.data.set(key, item);
+    // Repeated hits on the most recently used key are common; skip the no-op reorder for them.
+    if (key !== this.newestKey) {
+      this.data.delete(key);
+      this.data.set(key, item);
+      this.newestKey = key;
+    }
     return item.value;
   }
 
-  set(key: K, value: V): void {
-    if (this.data.has(key)) {
-      this.data.delete(key);
+  // ttlSeconds overrides the cache-wide TTL for this entry, e.g. to keep negative results for less time.
+  set(key: K, value: V, ttlSeconds?: number): void {
+    const ttlMs = ttlSeconds === undefined ? this.ttlMs : ttlSeconds * 1000;
+    if (this.sketch !== undefined && this.data.size >= this.maxItems && !this.data.has(key)) {
+      const victim = this.data.entries().next().value as [K, { expiresAt: number; value: V; bytes: number }] | undefined;
+      if (
+        victim !== undefined &&
+        performance.now() <= victim[1].expiresAt &&
+        this.sketch.estimate(key) < this.sketch.estimate(victim[0])
+      ) {
+        return;
+      }
     }
 
-    this.data.set(key, { timestamp: performance.now(), value });
+    const bytes = this.sizeOf?.(value) ?? 0;
+    if (bytes > this.maxBytes) {
+      // A value larger than the whole budget would evict everything else and still not fit.
+      this.remove(key);
+      return;
+    }
+
+    // Map keeps insertion order, so delete-then-set moves the key to the most recently used end.
+    this.remove(key);
+    this.data.set(key, { expiresAt: performance.now() + ttlMs, value, bytes });
+    this.totalBytes += bytes;
+    this.newestKey = key;
 
-    if (this.data.size > this.maxItems) {
+    while (this.data.size > this.maxItems || this.totalBytes > this.maxBytes) {
       const firstKey = this.data.keys().next().value as K | undefined;
-      if (firstKey !== undefined) {
-        this.data.delete(firstKey);
+      if (firstKey === undefined) {
+        break;
       }
+      this.remove(firstKey);
     }
   }
 
   clear(): void {
     this.data.clear();
+    this.totalBytes = 0;
+    this.newestKey = undefined;
   }
 
   has(key: K): boolean {
-    return this.get(key) !== undefined;
+    // A membership check only needs the entry and its age; it should not pay for an LRU reorder.
+    const item = this.data.get(key);
+    return item !== undefined && performance.now() <= item.expiresAt;
   }
 
   get size(): number {
     return this.data.size;
   }
+
+  // Live entries from least to most recently used, each with the milliseconds it has left.
+  entries(): Array<[K, V, number]> {
+    const now = performance.now();
+    const live: Array<[K, V, number]> = [];
+    for (const [key, item] of this.data) {
+      if (item.expiresAt > now) {
+        live.push([key, item.value, item.expiresAt - now]);
+      }
+    }
+    return live;
+  }
+
+  get bytes(): number {
+    return this.totalBytes;
+  }
+
+  private remove(key: K): void {
+    const item = this.data.get(key);
+    if (item !== undefined) {
+      this.totalBytes -= item.bytes;
+      this.data.delete(key);
+    }
+  }
 }
+
+// Contact card results from every RIR share one cache. Keys carry an RIR prefix so they never collide, and
+// the capacity is pooled instead of reserved per registry (roughly the three separate 500-item caches before).
+export const contactCache = new TTLCache<string, ToolResult<unknown>>({
+  maxItems: CACHE_MAX_ITEMS * 3,
+  ttlSeconds: 600
+});
+
+// Contact lookups already in flight, keyed like contactCache, so a burst of identical requests makes one upstream call.
+export const contactFlights = new SingleFlight<string, ToolResult<unknown>>();
+
+// AS-SET expansions and direct member lists from both registries share one cache, keyed "<rir>:as_set:..." and
+// "<rir>:as_set_members:...". Callers know which shape sits under each key and cast on read.
+export const asSetCache = new TTLCache<string, unknown>({
+  maxItems: 4000,
+  ttlSeconds: 300,
+  admission: true
+});
+
+// Lookups that found nothing are kept for a minute only, so a newly registered resource shows up quickly.
+export const NOT_FOUND_TTL_SECONDS = 60;
+
+// Registered route objects change on the order of days, so a confirmed match is kept for an hour. A miss keeps the
+// default TTL so a newly created route object is seen soon.
+export const ROUTE_EXISTS_TTL_SECONDS = 3600;
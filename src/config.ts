@@ -18,13 +18,15 @@ export function envIntWithFallback(key: string, fallbackKey: string, defaultValu
   return Number.isNaN(parsed) ? defaultValue : parsed;
 }
 
+const truthyValues = new Set(["true", "1", "yes", "on"]);
+
 export function envBool(key: string, defaultValue: boolean): boolean {
-  const raw = (process.env[key] ?? "").toLowerCase().trim();
+  const raw = process.env[key]?.toLowerCase().trim();
   if (!raw) {
     return defaultValue;
   }
 
-  return ["true", "1", "yes", "on"].includes(raw);
+  return truthyValues.has(raw);
 }
 
 export type RirId = "ripe" | "arin" | "apnic" | "afrinic" | "lacnic";
@@ -78,7 +80,13 @@ export const PORT43_CONNECT_TIMEOUT_SECONDS = envIntWithFallback("PORT43_CONNECT
 export const PORT43_READ_TIMEOUT_SECONDS = envIntWithFallback("PORT43_READ_TIMEOUT_SECONDS", "WHOIS_READ_TIMEOUT_SECONDS", 5);
 export const CACHE_TTL_SECONDS = envInt("CACHE_TTL_SECONDS", 60);
 export const CACHE_MAX_ITEMS = envInt("CACHE_MAX_ITEMS", 512);
+export const MAX_WHOIS_BYTES = envInt("MAX_WHOIS_BYTES", 4 * 1024 * 1024);
+export const WHOIS_CACHE_MAX_BYTES = envInt("WHOIS_CACHE_MAX_BYTES", 64 * 1024 * 1024);
+export const CACHE_SNAPSHOT_PATH = envStr("CACHE_SNAPSHOT_PATH", "");
 export const USER_AGENT = envStr("USER_AGENT", "inet-registry-mcp/1.0");
+export const ARIN_POC_CONCURRENCY = Math.max(1, envInt("ARIN_POC_CONCURRENCY", 8));
+export const RIPE_CONTACT_CONCURRENCY = Math.max(1, envInt("RIPE_CONTACT_CONCURRENCY", 8));
+export const AS_SET_CONCURRENCY = Math.max(1, envInt("AS_SET_CONCURRENCY", 16));
 
 export const HTTP_HOST = envStr("HTTP_HOST", "127.0.0.1");
 export const HTTP_PORT = envInt("HTTP_PORT", 8000);
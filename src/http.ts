@@ -6,10 +6,15 @@ import type { Transport } from "@modelcontextprotocol/sdk/shared/transport.js";
 import { HTTP_HOST, HTTP_PORT } from "./config.js";
 import { createInetRegistryMcpServer } from "./server.js";
 
+// Signals skip the exit event unless handled, so turn them into a normal exit (with the usual codes) and let
+// exit hooks such as the cache snapshot flush run.
+process.once("SIGINT", () => process.exit(130));
+process.once("SIGTERM", () => process.exit(143));
+
 const app = createMcpExpressApp();
 
 app.post("/mcp", async (req, res) => {
-  const server = createInetRegistryMcpServer();
+  const server = await createInetRegistryMcpServer();
   const transport = new StreamableHTTPServerTransport(
     {
       sessionIdGenerator: undefined
@@ -70,5 +75,6 @@ app.listen(HTTP_PORT, HTTP_HOST, (error?: Error) => {
     process.exit(1);
   }
 
-  console.log(`Starting inet-registry-mcp server on http://${HTTP_HOST}:${HTTP_PORT}`);
+  // Keep stdout free of anything but protocol frames, even on the HTTP transport.
+  console.error(`Starting inet-registry-mcp server on http://${HTTP_HOST}:${HTTP_PORT}`);
 });
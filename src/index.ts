@@ -3,8 +3,13 @@ import { StdioServerTransport } from "@modelcontextprotocol/sdk/server/stdio.js"
 
 import { createInetRegistryMcpServer } from "./server.js";
 
+// Signals skip the exit event unless handled, so turn them into a normal exit (with the usual codes) and let
+// exit hooks such as the cache snapshot flush run.
+process.once("SIGINT", () => process.exit(130));
+process.once("SIGTERM", () => process.exit(143));
+
 async function main(): Promise<void> {
-  const server = createInetRegistryMcpServer();
+  const server = await createInetRegistryMcpServer();
   await server.connect(new StdioServerTransport());
 }
 
@@ -0,0 +1,24 @@
+// Parses an "AS<digits>" member (any case) straight from its char codes. AS-SET members are checked one by one
+// and large sets list tens of thousands of ASNs, so this skips the match array and substring a regex would build.
+// Returns null for anything else, including set names such as "AS-FOO".
+export function parseAsnMember(member: string): number | null {
+  if (member.length < 3) {
+    return null;
+  }
+
+  const a = member.charCodeAt(0) | 0x20;
+  const s = member.charCodeAt(1) | 0x20;
+  if (a !== 0x61 || s !== 0x73) {
+    return null;
+  }
+
+  let asn = 0;
+  for (let index = 2; index < member.length; index++) {
+    const digit = member.charCodeAt(index) - 0x30;
+    if (digit < 0 || digit > 9) {
+      return null;
+    }
+    asn = asn * 10 + digit;
+  }
+  return asn;
+}
@@ -0,0 +1,35 @@
+// Runs fn over items with at most `limit` calls in flight. A worker picks up the next item as soon as its
+// previous call settles, rather than waiting for a whole batch. Results keep the input order.
+export async function mapWithConcurrency<T, R>(items: readonly T[], limit: number, fn: (item: T) => Promise<R>): Promise<R[]> {
+  const results = new Array<R>(items.length);
+  let next = 0;
+
+  const worker = async (): Promise<void> => {
+    while (next < items.length) {
+      const index = next++;
+      results[index] = await fn(items[index] as T);
+    }
+  };
+
+  await Promise.all(Array.from({ length: Math.min(limit, items.length) }, worker));
+  return results;
+}
+
+// Coalesces concurrent calls for the same key: while one lookup is in flight, later callers share its promise
+// instead of issuing their own request. The entry is dropped once the lookup settles, so results are not kept.
+export class SingleFlight<K, V> {
+  private readonly inflight = new Map<K, Promise<V>>();
+
+  run<T extends V>(key: K, fn: () => Promise<T>): Promise<T> {
+    const existing = this.inflight.get(key);
+    if (existing !== undefined) {
+      return existing as Promise<T>;
+    }
+
+    const promise = fn().finally(() => {
+      this.inflight.delete(key);
+    });
+    this.inflight.set(key, promise);
+    return promise;
+  }
+}
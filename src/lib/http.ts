@@ -1,7 +1,20 @@
 import { HTTP_TIMEOUT_SECONDS, USER_AGENT } from "../config.js";
 import http from "node:http";
 import https from "node:https";
+import { pipeline } from "node:stream";
+import { StringDecoder } from "node:string_decoder";
 import { URL } from "node:url";
+import zlib from "node:zlib";
+
+import { cachedLookup } from "./lookup.js";
+
+// One pooled agent per scheme keeps sockets to the RDAP and REST hosts open between lookups, so repeat
+// requests skip the TCP and TLS handshakes. Idle sockets are unref'd by the agent and never hold the process open.
+// New sockets resolve through the same short-lived DNS cache as the WHOIS client, so a fan-out that opens many
+// connections at once does not queue a getaddrinfo call per socket on libuv's thread pool.
+const agentOptions = { keepAlive: true, keepAliveMsecs: 30_000, maxSockets: 100, maxFreeSockets: 20, lookup: cachedLookup };
+const httpAgent = new http.Agent(agentOptions);
+const httpsAgent = new https.Agent(agentOptions);
 
 export class HttpStatusError extends Error {
   readonly status: number;
@@ -28,7 +41,8 @@ export class FetchJsonHttpClient implements JsonHttpClient {
         "User-Agent": USER_AGENT,
         ...(options.headers ?? {})
       },
-      redirectsRemaining: 5
+      redirectsRemaining: 5,
+      discardNotFoundBody: "notFoundValue" in options
     });
 
     if (response.status === 404 && "notFoundValue" in options) {
@@ -48,7 +62,8 @@ export class FetchJsonHttpClient implements JsonHttpClient {
         "User-Agent": USER_AGENT,
         ...(options.headers ?? {})
       },
-      redirectsRemaining: 5
+      redirectsRemaining: 5,
+      discardNotFoundBody: "notFoundValue" in options
     });
 
     if (response.status === 404 && "notFoundValue" in options) {
@@ -71,18 +86,20 @@ interface TextResponse {
 
 function getText(
   url: string,
-  options: { headers: Record<string, string>; redirectsRemaining: number }
+  options: { headers: Record<string, string>; redirectsRemaining: number; discardNotFoundBody: boolean }
 ): Promise<TextResponse> {
   const parsedUrl = new URL(url);
-  const client = parsedUrl.protocol === "http:" ? http : https;
+  const isHttp = parsedUrl.protocol === "http:";
+  const client = isHttp ? http : https;
 
   return new Promise((resolve, reject) => {
     const request = client.request(
       parsedUrl,
       {
         method: "GET",
-        headers: options.headers,
-        family: 4
+        headers: { "Accept-Encoding": "gzip, deflate, br", ...options.headers },
+        family: 4,
+        agent: isHttp ? httpAgent : httpsAgent
       },
       (response) => {
         const status = response.statusCode ?? 0;
@@ -94,20 +111,36 @@ function getText(
           const nextUrl = new URL(location, parsedUrl).toString();
           getText(nextUrl, {
             headers: options.headers,
-            redirectsRemaining: options.redirectsRemaining - 1
+            redirectsRemaining: options.redirectsRemaining - 1,
+            discardNotFoundBody: options.discardNotFoundBody
           })
             .then(resolve)
             .catch(reject);
           return;
         }
 
-        const chunks: Buffer[] = [];
-        response.on("data", (chunk: Buffer) => chunks.push(chunk));
-        response.on("end", () => {
+        // Callers that map 404 to a fixed value never read the error page, so drain it without buffering.
+        if (status === 404 && options.discardNotFoundBody) {
+          response.resume();
+          resolve({ status, statusText, text: "" });
+          return;
+        }
+
+        const body = decodedBody(response, reject);
+        // Decode as chunks arrive instead of collecting them and copying everything into one joined Buffer.
+        // The decoder carries multi-byte characters that straddle chunk boundaries.
+        const decoder = new StringDecoder("utf8");
+        let text = "";
+        body.on("data", (chunk: Buffer) => {
+          text += decoder.write(chunk);
+        });
+        body.on("error", reject);
+        body.on("end", () => {
+          text += decoder.end();
           resolve({
             status,
             statusText,
-            text: Buffer.concat(chunks).toString("utf8")
+            text
           });
         });
       }
@@ -121,6 +154,34 @@ function getText(
   });
 }
 
+// RDAP and REST replies are mostly repetitive JSON and compress well; decode whatever the server chose to send.
+// pipeline forwards a failure on the response (reset socket, aborted body, request timeout) to the caller, which a
+// bare .pipe() would leave with a decoder that never ends.
+function decodedBody(response: http.IncomingMessage, onError: (error: Error) => void): NodeJS.ReadableStream {
+  const decoder = responseDecoder(response.headers["content-encoding"]);
+  if (decoder === undefined) {
+    return response;
+  }
+  return pipeline(response, decoder, (error) => {
+    if (error) {
+      onError(error);
+    }
+  });
+}
+
+function responseDecoder(encoding: string | undefined): zlib.Gunzip | zlib.Inflate | zlib.BrotliDecompress | undefined {
+  switch (encoding) {
+    case "gzip":
+      return zlib.createGunzip();
+    case "deflate":
+      return zlib.createInflate();
+    case "br":
+      return zlib.createBrotliDecompress();
+    default:
+      return undefined;
+  }
+}
+
 export function errorDetail(error: unknown): string {
   if (error instanceof Error && error.message) {
     return error.message;
@@ -0,0 +1,42 @@
+import dns from "node:dns";
+import type net from "node:net";
+
+import { TTLCache } from "../cache.js";
+
+const lookupCache = new TTLCache<string, dns.LookupAddress[]>({
+  maxItems: 64,
+  ttlSeconds: 300
+});
+
+export const cachedLookup: net.LookupFunction = (hostname, options, callback) => {
+  const respond = (addresses: dns.LookupAddress[]): void => {
+    if (options.all) {
+      callback(null, addresses);
+      return;
+    }
+
+    const first = addresses[0];
+    if (!first) {
+      callback(Object.assign(new Error(`getaddrinfo ENOTFOUND ${hostname}`), { code: "ENOTFOUND" }), "");
+      return;
+    }
+    callback(null, first.address, first.family);
+  };
+
+  const key = `${hostname}|${String(options.family ?? 0)}`;
+  const cached = lookupCache.get(key);
+  if (cached !== undefined) {
+    respond(cached);
+    return;
+  }
+
+  dns.lookup(hostname, { ...options, all: true }, (error, addresses) => {
+    if (error) {
+      callback(error, "");
+      return;
+    }
+
+    lookupCache.set(key, addresses);
+    respond(addresses);
+  });
+};
@@ -1,18 +1,19 @@
 import net from "node:net";
 
-export function validateIpPrefix(prefix: string): void {
+// Returns the address family so callers can pick v4/v6 behaviour without rescanning the string.
+export function validateIpPrefix(prefix: string): 4 | 6 {
   const [address, length, extra] = prefix.split("/");
   if (!address || extra !== undefined) {
     throw new Error(`Invalid IP prefix: ${prefix}`);
   }
 
   const version = net.isIP(address);
-  if (version === 0) {
+  if (version !== 4 && version !== 6) {
     throw new Error(`Invalid IP prefix: ${prefix}`);
   }
 
   if (length === undefined) {
-    return;
+    return version;
   }
 
   if (!/^\d+$/.test(length)) {
@@ -24,4 +25,6 @@ export function validateIpPrefix(prefix: string): void {
   if (parsedLength < 0 || parsedLength > maxLength) {
     throw new Error(`Invalid IP prefix: ${prefix}`);
   }
+
+  return version;
 }
@@ -10,3 +10,24 @@ export function ripeAttrs(obj: unknown, name: string): string[] {
     .filter((attr) => attr.name === name && stringValue(attr.value).trim())
     .map((attr) => stringValue(attr.value).trim());
 }
+
+// Buckets every non-empty attribute value by name in one walk, for callers that read several attributes of
+// the same object. Values keep their order within each name.
+export function ripeAttrIndex(obj: unknown): Map<string, string[]> {
+  const index = new Map<string, string[]>();
+  for (const rawAttr of asArray(asRecord(asRecord(obj).attributes).attribute)) {
+    const attr = asRecord(rawAttr);
+    const value = stringValue(attr.value).trim();
+    if (typeof attr.name !== "string" || !value) {
+      continue;
+    }
+
+    const values = index.get(attr.name);
+    if (values === undefined) {
+      index.set(attr.name, [value]);
+    } else {
+      values.push(value);
+    }
+  }
+  return index;
+}
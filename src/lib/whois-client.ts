@@ -1,7 +1,8 @@
 import net from "node:net";
 
-import { PORT43_CONNECT_TIMEOUT_SECONDS, PORT43_READ_TIMEOUT_SECONDS } from "../config.js";
+import { MAX_WHOIS_BYTES, PORT43_CONNECT_TIMEOUT_SECONDS, PORT43_READ_TIMEOUT_SECONDS } from "../config.js";
 import type { WhoisEndpoint } from "../config.js";
+import { cachedLookup } from "./lookup.js";
 
 export class WhoisTimeoutError extends Error {
   constructor(readonly phase: "connect" | "read") {
@@ -10,6 +11,13 @@ export class WhoisTimeoutError extends Error {
   }
 }
 
+export class WhoisResponseTooLargeError extends Error {
+  constructor(readonly limit: number) {
+    super(`WHOIS response exceeded ${limit} bytes`);
+    this.name = "WhoisResponseTooLargeError";
+  }
+}
+
 export interface WhoisQueryOptions {
   chunkSize: number;
   readTimeoutReturnsPartial: boolean;
@@ -22,23 +30,47 @@ export interface WhoisClient {
 export class NodeWhoisClient implements WhoisClient {
   async query(endpoint: WhoisEndpoint, line: string, options: WhoisQueryOptions): Promise<string> {
     return new Promise((resolve, reject) => {
+      let buffer = Buffer.allocUnsafe(options.chunkSize);
+      let received = 0;
+
+      // Reads land directly in the free tail of the response buffer, so no per-chunk Buffer is allocated and
+      // nothing is copied out of one. The buffer doubles whenever less than one chunk of space is left.
+      const freeSpace = (): Buffer => {
+        if (buffer.length - received < options.chunkSize) {
+          const grown = Buffer.allocUnsafe(Math.max(buffer.length * 2, received + options.chunkSize));
+          buffer.copy(grown, 0, 0, received);
+          buffer = grown;
+        }
+        return buffer.subarray(received);
+      };
+
       const socket = net.createConnection({
         host: endpoint.server,
         port: endpoint.port,
-        family: 4
+        family: 4,
+        lookup: cachedLookup,
+        noDelay: true,
+        keepAlive: true,
+        onread: {
+          buffer: freeSpace,
+          callback: (bytesRead: number): boolean => {
+            received += bytesRead;
+            // A server that keeps streaming past any sane reply size is cut off rather than buffered.
+            if (received > MAX_WHOIS_BYTES) {
+              settleReject(new WhoisResponseTooLargeError(MAX_WHOIS_BYTES));
+              return false;
+            }
+            return true;
+          }
+        }
       });
-      const chunks: Buffer[] = [];
       let settled = false;
       let connectTimer: NodeJS.Timeout | undefined;
-      let readTimer: NodeJS.Timeout | undefined;
 
       const cleanup = (): void => {
         if (connectTimer) {
           clearTimeout(connectTimer);
         }
-        if (readTimer) {
-          clearTimeout(readTimer);
-        }
         socket.removeAllListeners();
         socket.destroy();
       };
@@ -48,7 +80,7 @@ export class NodeWhoisClient implements WhoisClient {
           return;
         }
         settled = true;
-        const text = Buffer.concat(chunks).toString("utf8");
+        const text = buffer.toString("utf8", 0, received);
         cleanup();
         resolve(text);
       };
@@ -62,19 +94,6 @@ export class NodeWhoisClient implements WhoisClient {
         reject(error);
       };
 
-      const startReadTimer = (): void => {
-        if (readTimer) {
-          clearTimeout(readTimer);
-        }
-        readTimer = setTimeout(() => {
-          if (options.readTimeoutReturnsPartial) {
-            settleResolve();
-          } else {
-            settleReject(new WhoisTimeoutError("read"));
-          }
-        }, PORT43_READ_TIMEOUT_SECONDS * 1000);
-      };
-
       connectTimer = setTimeout(() => {
         settleReject(new WhoisTimeoutError("connect"));
       }, PORT43_CONNECT_TIMEOUT_SECONDS * 1000);
@@ -85,12 +104,16 @@ export class NodeWhoisClient implements WhoisClient {
           connectTimer = undefined;
         }
         socket.write(line, "utf8");
-        startReadTimer();
+        // The socket's own idle timer is refreshed on activity, so reads need no per-chunk timer.
+        socket.setTimeout(PORT43_READ_TIMEOUT_SECONDS * 1000);
       });
 
-      socket.on("data", (chunk: Buffer) => {
-        chunks.push(chunk.subarray(0, options.chunkSize));
-        startReadTimer();
+      socket.on("timeout", () => {
+        if (options.readTimeoutReturnsPartial) {
+          settleResolve();
+        } else {
+          settleReject(new WhoisTimeoutError("read"));
+        }
       });
 
       socket.on("end", settleResolve);
@@ -2,14 +2,7 @@ import type { McpServer } from "@modelcontextprotocol/sdk/server/mcp.js";
 
 import { RIRS, type RirId } from "./config.js";
 import type { ToolDependencies } from "./deps.js";
-import { registerArinAsSetTool } from "./tools/arin/as-set.js";
-import { registerArinContactTool } from "./tools/arin/contact.js";
-import { registerArinRouteTool } from "./tools/arin/route.js";
 import { registerAuthTools } from "./tools/auth.js";
-import { registerRdapContactTool } from "./tools/rdap-contact.js";
-import { registerRipeAsSetTool } from "./tools/ripe/as-set.js";
-import { registerRipeContactTool } from "./tools/ripe/contact.js";
-import { registerRipeRouteTool } from "./tools/ripe/route.js";
 import { registerWhoisTool } from "./tools/whois.js";
 
 export function registeredToolNames(enabled: Partial<Record<RirId, boolean>> = {}): string[] {
@@ -40,10 +33,17 @@ export function registeredToolNames(enabled: Partial<Record<RirId, boolean>> = {
   return names;
 }
 
-export function registerTools(server: McpServer, deps: ToolDependencies): void {
+// RIR-specific tool modules are imported only when their RIR is enabled. The module loader caches them,
+// so servers created per HTTP request pay the import cost once per process.
+export async function registerTools(server: McpServer, deps: ToolDependencies): Promise<void> {
   registerAuthTools(server, deps);
 
   if (RIRS.ripe.enabled) {
+    const [{ registerRipeAsSetTool }, { registerRipeRouteTool }, { registerRipeContactTool }] = await Promise.all([
+      import("./tools/ripe/as-set.js"),
+      import("./tools/ripe/route.js"),
+      import("./tools/ripe/contact.js")
+    ]);
     registerWhoisTool(server, RIRS.ripe, deps);
     registerRipeAsSetTool(server, deps);
     registerRipeRouteTool(server, deps);
@@ -51,15 +51,21 @@ export function registerTools(server: McpServer, deps: ToolDependencies): void {
   }
 
   if (RIRS.arin.enabled) {
+    const [{ registerArinRouteTool }, { registerArinAsSetTool }, { registerArinContactTool }] = await Promise.all([
+      import("./tools/arin/route.js"),
+      import("./tools/arin/as-set.js"),
+      import("./tools/arin/contact.js")
+    ]);
     registerWhoisTool(server, RIRS.arin, deps);
     registerArinRouteTool(server, deps);
     registerArinAsSetTool(server, deps);
     registerArinContactTool(server, deps);
   }
 
-  for (const rirId of ["apnic", "afrinic", "lacnic"] as const) {
-    const rir = RIRS[rirId];
-    if (rir.enabled) {
+  const rdapRirs = (["apnic", "afrinic", "lacnic"] as const).map((rirId) => RIRS[rirId]).filter((rir) => rir.enabled);
+  if (rdapRirs.length > 0) {
+    const { registerRdapContactTool } = await import("./tools/rdap-contact.js");
+    for (const rir of rdapRirs) {
       registerWhoisTool(server, rir, deps);
       registerRdapContactTool(server, rir, deps);
     }
@@ -3,7 +3,7 @@ import { McpServer } from "@modelcontextprotocol/sdk/server/mcp.js";
 import { defaultToolDependencies, type ToolDependencies } from "./deps.js";
 import { registerTools } from "./register.js";
 
-export function createInetRegistryMcpServer(deps: ToolDependencies = defaultToolDependencies): McpServer {
+export async function createInetRegistryMcpServer(deps: ToolDependencies = defaultToolDependencies): Promise<McpServer> {
   const server = new McpServer(
     {
       name: "inet-registry-mcp",
@@ -16,6 +16,6 @@ export function createInetRegistryMcpServer(deps: ToolDependencies = defaultTool
     }
   );
 
-  registerTools(server, deps);
+  await registerTools(server, deps);
   return server;
 }
@@ -1,9 +1,11 @@
 import type { McpServer } from "@modelcontextprotocol/sdk/server/mcp.js";
 import * as z from "zod/v4";
 
-import { ARIN_REST_BASE, RIRS } from "../../config.js";
-import { TTLCache } from "../../cache.js";
+import { ARIN_REST_BASE, AS_SET_CONCURRENCY } from "../../config.js";
+import { asSetCache } from "../../cache.js";
 import type { ToolDependencies } from "../../deps.js";
+import { parseAsnMember } from "../../lib/asn.js";
+import { mapWithConcurrency, SingleFlight } from "../../lib/concurrency.js";
 import { HttpStatusError } from "../../lib/http.js";
 import { asRecord } from "../../lib/object.js";
 import { toMcpResult, type ToolResult } from "../../types.js";
@@ -15,10 +17,19 @@ interface AsSetData {
   status?: "not-found" | "empty" | "expanded";
 }
 
-const cache = new TTLCache<string, Set<number>>({
-  maxItems: 1000,
-  ttlSeconds: 300
-});
+interface Expansion {
+  // Sorted once when the expansion finishes, so cache hits return it as is.
+  asns: number[];
+  // Layers actually walked. When the walk ran out of nested sets, any max_depth at or above this gives the same ASNs.
+  layers: number;
+  complete: boolean;
+}
+
+// Direct members of each set are cached too, so expansions that pass through the same nested set reuse one fetch.
+const memberFlights = new SingleFlight<string, string[]>();
+
+// Member lists arrive as comma and/or whitespace separated text; one scan pulls out the tokens.
+const memberTokenPattern = /[^\s,]+/g;
 
 async function getAsSetData(setname: string, deps: ToolDependencies): Promise<Record<string, unknown>> {
   try {
@@ -46,7 +57,7 @@ function extractMembers(data: Record<string, unknown>): string[] {
         }
       }
     } else if (typeof value === "string") {
-      members.push(...value.replaceAll(",", " ").split(/\s+/).filter(Boolean));
+      members.push(...(value.match(memberTokenPattern) ?? []));
     } else if (value) {
       members.push(String(value).trim());
     }
@@ -56,105 +67,113 @@ function extractMembers(data: Record<string, unknown>): string[] {
   return members;
 }
 
-async function expandRecursive(
-  setname: string,
-  seen: Set<string>,
-  outAsns: Set<number>,
-  foundSets: Set<string>,
-  deps: ToolDependencies,
-  depth = 0,
-  maxDepth = 10
-): Promise<void> {
-  if (depth >= maxDepth || seen.has(setname)) {
-    return;
-  }
-  seen.add(setname);
-
-  const cacheKey = `arin:as_set:${setname}`;
-  const cached = cache.get(cacheKey);
-  if (cached !== undefined && cached.size > 0) {
-    for (const asn of cached) {
-      outAsns.add(asn);
-    }
-    foundSets.add(setname);
-    return;
+async function getMembers(setname: string, deps: ToolDependencies): Promise<string[]> {
+  const cacheKey = `arin:as_set_members:${setname}`;
+  const cached = asSetCache.get(cacheKey) as string[] | undefined;
+  if (cached !== undefined) {
+    return cached;
   }
 
-  const data = await getAsSetData(setname, deps);
-  foundSets.add(setname);
-  const members = extractMembers(data);
-  if (members.length === 0) {
-    return;
-  }
+  // Concurrent expansions that reach the same set before it is cached share one fetch.
+  return memberFlights.run(cacheKey, async () => {
+    const members = extractMembers(await getAsSetData(setname, deps));
+    asSetCache.set(cacheKey, members);
+    return members;
+  });
+}
 
+// Expands one layer of nested sets at a time, fetching every set in a layer concurrently, so wall time grows
+// with the nesting depth rather than the number of sets.
+async function expandLayers(root: string, deps: ToolDependencies, maxDepth: number): Promise<Expansion> {
   const asns = new Set<number>();
-  for (const memberRaw of members) {
-    const member = memberRaw.trim().toUpperCase();
-    if (member.startsWith("AS") && /^\d+$/.test(member.slice(2))) {
-      asns.add(Number.parseInt(member.slice(2), 10));
-    } else if (member.startsWith("AS-")) {
-      try {
-        await expandRecursive(member, seen, asns, foundSets, deps, depth + 1, maxDepth);
-      } catch {
-        // Match Python behavior: continue when one nested AS-SET fails.
+  const seen = new Set<string>([root.toUpperCase()]);
+  let frontier = [root];
+  let truncated = false;
+  let depth = 0;
+
+  for (; depth < maxDepth && frontier.length > 0; depth++) {
+    // A failure on the root set is the caller's error; a failing nested set is skipped like an empty one.
+    const layer = await mapWithConcurrency(frontier, AS_SET_CONCURRENCY, (setname) =>
+      depth === 0 ? getMembers(setname, deps) : getMembers(setname, deps).catch(() => [])
+    );
+
+    const lastLayer = depth + 1 >= maxDepth;
+    const next: string[] = [];
+    for (const members of layer) {
+      for (const memberRaw of members) {
+        const member = memberRaw.trim();
+        const asn = parseAsnMember(member);
+        if (asn !== null) {
+          asns.add(asn);
+          continue;
+        }
+
+        const setname = member.toUpperCase();
+        if (!setname.startsWith("AS-") || seen.has(setname)) {
+          continue;
+        }
+        // Sets found on the last allowed layer are never fetched; just note that the walk was cut short.
+        if (lastLayer) {
+          truncated = true;
+          continue;
+        }
+        seen.add(setname);
+        next.push(setname);
       }
     }
+    frontier = next;
   }
 
-  cache.set(`arin:as_set:${setname}`, asns);
-  for (const asn of asns) {
-    outAsns.add(asn);
+  return { asns: [...asns].sort((a, b) => a - b), layers: depth, complete: !truncated && frontier.length === 0 };
+}
+
+// A complete expansion is stored once under the bare set name and answers every depth deep enough to reach
+// its leaves; truncated expansions are only valid for the depth that produced them.
+function cachedExpansion(setname: string, maxDepth: number): Expansion | undefined {
+  const complete = asSetCache.get(`arin:as_set:${setname}`) as Expansion | undefined;
+  if (complete !== undefined && complete.layers <= maxDepth) {
+    return complete;
   }
+  return asSetCache.get(`arin:as_set:${setname}:depth_${maxDepth}`) as Expansion | undefined;
 }
 
 export async function handleArinAsSet(
   args: { setname: string; max_depth?: number },
   deps: ToolDependencies
 ): Promise<ToolResult<AsSetData>> {
-  const rir = RIRS.arin;
-  if (!rir.enabled) {
-    return {
-      ok: false,
-      error: "service_disabled",
-      detail: "ARIN AS-SET expansion support is disabled. Set SUPPORT_ARIN=true to enable."
-    };
-  }
-
   const maxDepth = args.max_depth ?? 10;
-  const cacheKey = `arin:as_set:${args.setname}:depth_${maxDepth}`;
-  const cached = cache.get(cacheKey);
+  const cached = cachedExpansion(args.setname, maxDepth);
   if (cached !== undefined) {
     return {
       ok: true,
       data: {
         as_set: args.setname,
-        asns: [...cached].sort((a, b) => a - b),
-        count: cached.size
+        asns: cached.asns,
+        count: cached.asns.length
       }
     };
   }
 
   try {
-    const seen = new Set<string>();
-    const asns = new Set<number>();
-    const foundSets = new Set<string>();
-    await expandRecursive(args.setname, seen, asns, foundSets, deps, 0, maxDepth);
+    const expansion = await expandLayers(args.setname, deps, maxDepth);
+    const asns = expansion.asns;
 
     let data: AsSetData;
-    if (!foundSets.has(args.setname)) {
-      data = { as_set: args.setname, asns: [], count: 0, status: "not-found" };
-    } else if (asns.size === 0) {
+    if (asns.length === 0) {
       data = { as_set: args.setname, asns: [], count: 0, status: "empty" };
     } else {
       data = {
         as_set: args.setname,
-        asns: [...asns].sort((a, b) => a - b),
-        count: asns.size,
+        asns,
+        count: asns.length,
         status: "expanded"
       };
     }
 
-    cache.set(cacheKey, asns);
+    asSetCache.set(
+      expansion.complete ? `arin:as_set:${args.setname}` : `arin:as_set:${args.setname}:depth_${maxDepth}`,
+      expansion
+    );
     return { ok: true, data };
   } catch (error) {
     return {
@@ -1,12 +1,19 @@
 import type { McpServer } from "@modelcontextprotocol/sdk/server/mcp.js";
-import * as z from "zod/v4";
 
-import { TTLCache } from "../../cache.js";
-import { ARIN_REST_BASE, RIRS } from "../../config.js";
+import { contactCache, contactFlights, NOT_FOUND_TTL_SECONDS, TTLCache } from "../../cache.js";
+import { ARIN_POC_CONCURRENCY, ARIN_REST_BASE } from "../../config.js";
 import type { ToolDependencies } from "../../deps.js";
+import { mapWithConcurrency } from "../../lib/concurrency.js";
 import { asArray, asRecord, dollarString, normalizeList } from "../../lib/object.js";
 import { toMcpResult, type ToolResult } from "../../types.js";
-import type { ContactArgs } from "../rdap-contact.js";
+import {
+  badContactParamsResult,
+  contactInputSchema,
+  contactQuery,
+  providedContactParams,
+  type ContactArgs,
+  type ContactQuery
+} from "../contact-args.js";
 
 interface ArinContactData {
   query: { type: string; value: string | null | undefined };
@@ -17,17 +24,19 @@ interface ArinContactData {
   noc_contacts: Record<string, unknown>[];
 }
 
-const cache = new TTLCache<string, ToolResult<ArinContactData>>({
-  maxItems: 500,
-  ttlSeconds: 600
-});
-
 interface PocLink {
   handle: string;
   function: string;
   description: string;
 }
 
+// POC records are shared by many networks under one org and rarely change, so they are cached on their own
+// for longer than the contact cards that reference them.
+const pocCache = new TTLCache<string, Record<string, unknown>>({
+  maxItems: 2000,
+  ttlSeconds: 3600
+});
+
 async function getJson(deps: ToolDependencies, url: string): Promise<Record<string, unknown>> {
   return asRecord(await deps.httpClient.getJson(url, { notFoundValue: {}, headers: { Accept: "application/json" } }));
 }
@@ -39,6 +48,11 @@ function dollarStringList(value: unknown): string[] {
 }
 
 async function getPocDetails(deps: ToolDependencies, pocHandle: string): Promise<Record<string, unknown> | null> {
+  const cached = pocCache.get(pocHandle);
+  if (cached !== undefined) {
+    return cached;
+  }
+
   try {
     const pocData = await getJson(deps, `${ARIN_REST_BASE}/poc/${pocHandle}`);
     if (Object.keys(pocData).length === 0) {
@@ -49,13 +63,15 @@ async function getPocDetails(deps: ToolDependencies, pocHandle: string): Promise
     const emails = dollarStringList(asRecord(poc.emails).email);
     const phones = dollarStringList(asRecord(poc.phones).phone);
 
-    return {
+    const details = {
       handle: pocHandle,
       name: dollarString(poc.companyName) || dollarString(poc.contactName),
       emails,
       phones,
       type: dollarString(poc.contactType)
     };
+    pocCache.set(pocHandle, details);
+    return details;
   } catch {
     return null;
   }
@@ -84,73 +100,69 @@ async function getOrgPocLinks(deps: ToolDependencies, orgHandle: unknown): Promi
   return extractPocLinks(orgPocs);
 }
 
-function pocLinkRole(pocLink: PocLink): string {
-  return `${pocLink.function} ${pocLink.description}`.toLowerCase();
-}
+// A REST reply wraps its payload in exactly one of these keys; both the org summary and the POC links come from it.
+const arinTopKeys = ["net", "asn", "org"] as const;
 
-function isAbusePoc(pocLink: PocLink): boolean {
-  const func = pocLink.function.toLowerCase();
-  return func === "ab" || pocLinkRole(pocLink).includes("abuse");
-}
+function arinOrganization(topKey: (typeof arinTopKeys)[number], source: Record<string, unknown>): Record<string, unknown> {
+  if (topKey === "org") {
+    return {
+      key: dollarString(source.handle),
+      name: dollarString(source.name),
+      country: "US"
+    };
+  }
 
-function isAdminPoc(pocLink: PocLink): boolean {
-  const func = pocLink.function.toLowerCase();
-  const role = pocLinkRole(pocLink);
-  return func === "ad" || role.includes("admin") || role.includes("administrative");
+  const orgRef = asRecord(source.orgRef);
+  return {
+    key: orgRef["@handle"] ?? "",
+    name: orgRef["@name"] ?? "",
+    country: "US"
+  };
 }
 
-function isTechPoc(pocLink: PocLink): boolean {
-  const func = pocLink.function.toLowerCase();
-  const role = pocLinkRole(pocLink);
-  return func === "t" || role.includes("tech") || role.includes("technical");
-}
+type PocCategory = "abuse" | "admin" | "tech" | "noc";
+
+// Checked in order, so a link whose description mentions abuse is filed as abuse whatever its function code.
+// "administrative" and "technical" are covered by their shorter keywords.
+const pocCategories: Array<{ category: PocCategory; code: string; keyword: string }> = [
+  { category: "abuse", code: "ab", keyword: "abuse" },
+  { category: "admin", code: "ad", keyword: "admin" },
+  { category: "tech", code: "t", keyword: "tech" },
+  { category: "noc", code: "n", keyword: "noc" }
+];
 
-function isNocPoc(pocLink: PocLink): boolean {
+function pocCategory(pocLink: PocLink): PocCategory | null {
   const func = pocLink.function.toLowerCase();
-  return func === "n" || pocLinkRole(pocLink).includes("noc");
+  const role = `${func} ${pocLink.description.toLowerCase()}`;
+  for (const { category, code, keyword } of pocCategories) {
+    if (func === code || role.includes(keyword)) {
+      return category;
+    }
+  }
+  return null;
 }
 
 export async function handleArinContact(args: ContactArgs, deps: ToolDependencies): Promise<ToolResult<ArinContactData>> {
-  const rir = RIRS.arin;
-  if (!rir.enabled) {
-    return {
-      ok: false,
-      error: "service_disabled",
-      detail: "ARIN contact card support is disabled. Set SUPPORT_ARIN=true to enable."
-    };
-  }
-
-  const providedParams = [args.ip, args.asn, args.org].filter((value) => value !== undefined && value !== null).length;
+  const providedParams = providedContactParams(args);
   if (providedParams !== 1) {
-    return {
-      ok: false,
-      error: "bad_request",
-      detail: "Provide exactly one of: ip, asn, or org"
-    };
+    return badContactParamsResult;
   }
 
-  let cacheKey: string;
-  let queryType: string;
-  let queryValue: string | null | undefined;
-  if (args.ip) {
-    cacheKey = `arin:contact_ip:${args.ip}`;
-    queryType = "ip";
-    queryValue = args.ip;
-  } else if (args.asn !== undefined && args.asn !== null) {
-    cacheKey = `arin:contact_asn:${args.asn}`;
-    queryType = "asn";
-    queryValue = String(args.asn);
-  } else {
-    cacheKey = `arin:contact_org:${args.org}`;
-    queryType = "org";
-    queryValue = args.org;
-  }
+  const { cacheKey, queryType, queryValue } = contactQuery("arin", args);
 
-  const cached = cache.get(cacheKey);
+  const cached = contactCache.get(cacheKey) as ToolResult<ArinContactData> | undefined;
   if (cached !== undefined) {
     return cached;
   }
 
+  return contactFlights.run(cacheKey, () => fetchArinContact(args, { cacheKey, queryType, queryValue }, deps));
+}
+
+async function fetchArinContact(
+  args: ContactArgs,
+  { cacheKey, queryType, queryValue }: ContactQuery,
+  deps: ToolDependencies
+): Promise<ToolResult<ArinContactData>> {
   try {
     let url: string;
     if (args.ip) {
@@ -168,59 +180,29 @@ export async function handleArinContact(args: ContactArgs, deps: ToolDependencie
         error: "not_found",
         detail: `No records found for ${queryType}='${queryValue}'`
       };
-      cache.set(cacheKey, result);
+      contactCache.set(cacheKey, result, NOT_FOUND_TTL_SECONDS);
       return result;
     }
 
-    let organization: Record<string, unknown> = {};
-    if ("net" in data) {
-      const orgRef = asRecord(asRecord(data.net).orgRef);
-      organization = {
-        key: orgRef["@handle"] ?? "",
-        name: orgRef["@name"] ?? "",
-        country: "US"
-      };
-    } else if ("asn" in data) {
-      const orgRef = asRecord(asRecord(data.asn).orgRef);
-      organization = {
-        key: orgRef["@handle"] ?? "",
-        name: orgRef["@name"] ?? "",
-        country: "US"
-      };
-    } else if ("org" in data) {
-      const orgData = asRecord(data.org);
-      organization = {
-        key: dollarString(orgData.handle),
-        name: dollarString(orgData.name),
-        country: "US"
-      };
-    }
-
-    const source = "net" in data ? asRecord(data.net) : "asn" in data ? asRecord(data.asn) : asRecord(data.org);
+    const topKey = arinTopKeys.find((key) => key in data);
+    const source = topKey === undefined ? {} : asRecord(data[topKey]);
+    const organization = topKey === undefined ? {} : arinOrganization(topKey, source);
     let pocLinks = extractPocLinks(source);
     if (pocLinks.length === 0) {
       pocLinks = await getOrgPocLinks(deps, organization.key);
     }
 
-    let abuseContact: Record<string, unknown> | null = null;
-    const adminContacts: Record<string, unknown>[] = [];
-    const techContacts: Record<string, unknown>[] = [];
-    const nocContacts: Record<string, unknown>[] = [];
-
-    for (const pocLink of pocLinks) {
-      const details = await getPocDetails(deps, pocLink.handle);
-      if (!details) {
-        continue;
-      }
-
-      if (isAbusePoc(pocLink)) {
-        abuseContact = details;
-      } else if (isAdminPoc(pocLink)) {
-        adminContacts.push(details);
-      } else if (isTechPoc(pocLink)) {
-        techContacts.push(details);
-      } else if (isNocPoc(pocLink)) {
-        nocContacts.push(details);
+    const categorized: Record<PocCategory, Record<string, unknown>[]> = { abuse: [], admin: [], tech: [], noc: [] };
+
+    // POC lookups are independent, so fetch them concurrently and categorise afterwards in link order.
+    const pocDetails = await mapWithConcurrency(pocLinks, ARIN_POC_CONCURRENCY, (pocLink) =>
+      getPocDetails(deps, pocLink.handle)
+    );
+    for (const [index, pocLink] of pocLinks.entries()) {
+      const details = pocDetails[index];
+      const category = pocCategory(pocLink);
+      if (details && category) {
+        categorized[category].push(details);
       }
     }
 
@@ -229,13 +211,14 @@ export async function handleArinContact(args: ContactArgs, deps: ToolDependencie
       data: {
         query: { type: queryType, value: queryValue },
         organization,
-        abuse: abuseContact,
-        admin_contacts: adminContacts,
-        tech_contacts: techContacts,
-        noc_contacts: nocContacts
+        // When a resource lists several abuse POCs the last one is reported, as before.
+        abuse: categorized.abuse.at(-1) ?? null,
+        admin_contacts: categorized.admin,
+        tech_contacts: categorized.tech,
+        noc_contacts: categorized.noc
       }
     };
-    cache.set(cacheKey, result);
+    contactCache.set(cacheKey, result);
     return result;
   } catch (error) {
     return {
@@ -252,11 +235,7 @@ export function registerArinContactTool(server: McpServer, deps: ToolDependencie
     {
       description:
         "PREFERRED TOOL for retrieving contact information (abuse, NOC, admin, tech) for IP addresses, ASNs, or organizations from the ARIN database.",
-      inputSchema: {
-        ip: z.string().nullable().optional().describe("IP address to look up contact information for in ARIN database (IPv4 or IPv6)"),
-        asn: z.number().int().nullable().optional().describe("ASN number to look up contact information for in ARIN database (without 'AS' prefix)"),
-        org: z.string().nullable().optional().describe("Organization handle/key to look up contact information for directly")
-      }
+      inputSchema: contactInputSchema("ARIN")
     },
     async (args) => toMcpResult(await handleArinContact(args, deps))
   );
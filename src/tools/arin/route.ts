@@ -1,9 +1,11 @@
 import type { McpServer } from "@modelcontextprotocol/sdk/server/mcp.js";
 import * as z from "zod/v4";
 
-import { ARIN_REST_BASE, RIRS } from "../../config.js";
-import { TTLCache } from "../../cache.js";
+import { ARIN_REST_BASE } from "../../config.js";
+import { ROUTE_EXISTS_TTL_SECONDS, TTLCache } from "../../cache.js";
+import { persistCache } from "../../cache-snapshot.js";
 import type { ToolDependencies } from "../../deps.js";
+import { parseAsnMember } from "../../lib/asn.js";
 import { HttpStatusError } from "../../lib/http.js";
 import { asArray, asRecord, stringValue } from "../../lib/object.js";
 import { validateIpPrefix } from "../../lib/prefix.js";
@@ -25,10 +27,26 @@ const cache = new TTLCache<string, ToolResult<RouteData>>({
   maxItems: 1000,
   ttlSeconds: 300
 });
+persistCache("arin_route", cache);
 
-async function searchRoute(prefix: string, deps: ToolDependencies): Promise<unknown> {
-  const routeType = prefix.includes(":") ? "route6" : "route";
-  const url = `${ARIN_REST_BASE}/irr/${routeType}/${prefix}`;
+const routeUrlBase: Record<4 | 6, string> = {
+  4: `${ARIN_REST_BASE}/irr/route/`,
+  6: `${ARIN_REST_BASE}/irr/route6/`
+};
+
+const digitsPattern = /^\d+$/;
+
+// ARIN reports origins as "AS64496" or bare digits. Anything else, such as a set name, matches no ASN.
+function originAsn(origin: unknown): number | null {
+  if (typeof origin === "number") {
+    return origin;
+  }
+  const text = String(origin).trim();
+  return parseAsnMember(text) ?? (digitsPattern.test(text) ? Number(text) : null);
+}
+
+async function searchRoute(prefix: string, version: 4 | 6, deps: ToolDependencies): Promise<unknown> {
+  const url = routeUrlBase[version] + prefix;
   try {
     return await deps.httpClient.getJson(url, { headers: { Accept: "application/json" } });
   } catch (error) {
@@ -40,49 +58,44 @@ async function searchRoute(prefix: string, deps: ToolDependencies): Promise<unkn
 }
 
 export async function handleArinRoute(args: RouteArgs, deps: ToolDependencies): Promise<ToolResult<RouteData>> {
-  const rir = RIRS.arin;
-  if (!rir.enabled) {
+  // Validate first so malformed prefixes never reach the cache, then key IPv6 case-insensitively.
+  let version: 4 | 6;
+  try {
+    version = validateIpPrefix(args.prefix);
+  } catch (error) {
     return {
       ok: false,
-      error: "service_disabled",
-      detail: "ARIN route validation support is disabled. Set SUPPORT_ARIN=true to enable."
+      error: "invalid_prefix",
+      detail: error instanceof Error ? error.message : String(error)
     };
   }
 
-  const cacheKey = `arin:route:${args.prefix}|${args.origin_asn}`;
+  const cacheKey = `arin:route:${version === 6 ? args.prefix.toLowerCase() : args.prefix}|${args.origin_asn}`;
   const cached = cache.get(cacheKey);
   if (cached !== undefined) {
     return cached;
   }
 
   try {
-    validateIpPrefix(args.prefix);
-  } catch (error) {
-    return {
-      ok: false,
-      error: "invalid_prefix",
-      detail: error instanceof Error ? error.message : String(error)
-    };
-  }
-
-  try {
-    const data = asRecord(await searchRoute(args.prefix, deps));
+    const data = asRecord(await searchRoute(args.prefix, version, deps));
     const rawRoutes = data.routes;
-    const routes = Array.isArray(rawRoutes) ? rawRoutes.map(asRecord) : rawRoutes ? [asRecord(rawRoutes)] : [];
+    const routes: unknown[] = Array.isArray(rawRoutes) ? rawRoutes : rawRoutes ? [rawRoutes] : [];
     const matches: Array<{ route: string; origin: string; source: string }> = [];
+    const originLabel = `AS${args.origin_asn}`;
 
-    for (const routeObj of routes) {
-      const route = stringValue(routeObj.route) || stringValue(routeObj.prefix);
+    for (const rawRoute of routes) {
+      const routeObj = asRecord(rawRoute);
+      // Most routes under a busy prefix belong to other origins, so rule those out before reading the route.
       const origin = routeObj.origin ?? routeObj.originAS ?? "";
-      if (!route || !origin) {
+      if (!origin || originAsn(origin) !== args.origin_asn) {
         continue;
       }
 
-      const originNum = Number.parseInt(String(origin).toUpperCase().replace("AS", ""), 10);
-      if (!Number.isNaN(originNum) && originNum === args.origin_asn) {
+      const route = stringValue(routeObj.route) || stringValue(routeObj.prefix);
+      if (route) {
         matches.push({
           route,
-          origin: `AS${originNum}`,
+          origin: originLabel,
           source: "arin_irr"
         });
       }
@@ -97,7 +110,7 @@ export async function handleArinRoute(args: RouteArgs, deps: ToolDependencies):
         origin_asn: args.origin_asn
       }
     };
-    cache.set(cacheKey, result);
+    cache.set(cacheKey, result, matches.length > 0 ? ROUTE_EXISTS_TTL_SECONDS : undefined);
     return result;
   } catch (error) {
     return {
@@ -0,0 +1,53 @@
+import * as z from "zod/v4";
+
+import type { ToolResult } from "../types.js";
+
+export interface ContactArgs {
+  ip?: string | null | undefined;
+  asn?: number | null | undefined;
+  org?: string | null | undefined;
+}
+
+function isProvided(value: unknown): boolean {
+  return value !== undefined && value !== null;
+}
+
+// Counts the lookup keys a contact card request supplied, without building a temporary array per call.
+export function providedContactParams(args: ContactArgs): number {
+  return Number(isProvided(args.ip)) + Number(isProvided(args.asn)) + Number(isProvided(args.org));
+}
+
+export interface ContactQuery {
+  cacheKey: string;
+  queryType: string;
+  queryValue: string | null | undefined;
+}
+
+// Resolves which key a validated request looks up and the cache key it is stored under for one registry.
+export function contactQuery(rirPrefix: string, args: ContactArgs): ContactQuery {
+  if (args.ip) {
+    return { cacheKey: `${rirPrefix}:contact_ip:${args.ip}`, queryType: "ip", queryValue: args.ip };
+  }
+  if (args.asn !== undefined && args.asn !== null) {
+    return { cacheKey: `${rirPrefix}:contact_asn:${args.asn}`, queryType: "asn", queryValue: String(args.asn) };
+  }
+  return { cacheKey: `${rirPrefix}:contact_org:${args.org}`, queryType: "org", queryValue: args.org };
+}
+
+// Static rejection shared by every contact card handler. Frozen because the same object is returned each time.
+export const badContactParamsResult: ToolResult<never> = Object.freeze({
+  ok: false,
+  error: "bad_request",
+  detail: "Provide exactly one of: ip, asn, or org"
+});
+
+// The org field reads the same for every registry, so one schema instance is shared by all contact tools.
+const orgSchema = z.string().nullable().optional().describe("Organization handle/key to look up contact information for directly");
+
+export function contactInputSchema(label: string) {
+  return {
+    ip: z.string().nullable().optional().describe(`IP address to look up contact information for in ${label} database (IPv4 or IPv6)`),
+    asn: z.number().int().nullable().optional().describe(`ASN number to look up contact information for in ${label} database (without 'AS' prefix)`),
+    org: orgSchema
+  };
+}
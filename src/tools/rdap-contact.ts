@@ -1,17 +1,22 @@
 import type { McpServer } from "@modelcontextprotocol/sdk/server/mcp.js";
-import * as z from "zod/v4";
+import { isIP } from "node:net";
 
-import { TTLCache } from "../cache.js";
+import { contactCache, contactFlights, NOT_FOUND_TTL_SECONDS } from "../cache.js";
 import type { RirConfig } from "../config.js";
 import type { ToolDependencies } from "../deps.js";
 import { asArray, asRecord, stringValue } from "../lib/object.js";
 import { toMcpResult, type ToolResult } from "../types.js";
-
-export interface ContactArgs {
-  ip?: string | null | undefined;
-  asn?: number | null | undefined;
-  org?: string | null | undefined;
-}
+import {
+  badContactParamsResult,
+  contactInputSchema,
+  contactQuery,
+  providedContactParams,
+  type ContactArgs,
+  type ContactQuery
+} from "./contact-args.js";
+import { handleWhoisQuery } from "./whois.js";
+
+export type { ContactArgs } from "./contact-args.js";
 
 interface RdapContact {
   name: unknown;
@@ -37,9 +42,16 @@ interface RdapContactData {
   registrant: RdapContact | null;
 }
 
-const contactCache = new TTLCache<string, ToolResult<RdapContactData>>({
-  maxItems: 500,
-  ttlSeconds: 600
+const orgNotSupportedResult: ToolResult<never> = Object.freeze({
+  ok: false,
+  error: "not_supported",
+  detail: "Direct organization queries are not supported. Please use an IP address or ASN instead."
+});
+
+const noQueryParamResult: ToolResult<never> = Object.freeze({
+  ok: false,
+  error: "bad_request",
+  detail: "Internal error: no valid query parameter"
 });
 
 const labels: Record<string, string> = {
@@ -48,6 +60,45 @@ const labels: Record<string, string> = {
   lacnic: "LACNIC"
 };
 
+type VcardHandler = (contact: RdapContact, prop: unknown[]) => void;
+
+// One lookup per property instead of walking a comparison chain; properties we do not use fall through.
+const vcardHandlers = new Map<string, VcardHandler>([
+  [
+    "fn",
+    (contact, prop) => {
+      if (prop[3]) {
+        contact.name = prop[3];
+      }
+    }
+  ],
+  [
+    "email",
+    (contact, prop) => {
+      if (prop[3]) {
+        contact.emails.push(prop[3]);
+      }
+    }
+  ],
+  [
+    "tel",
+    (contact, prop) => {
+      if (prop[3]) {
+        contact.phones.push(prop[3]);
+      }
+    }
+  ],
+  [
+    "adr",
+    (contact, prop) => {
+      const params = asRecord(prop[1]);
+      if ("label" in params) {
+        contact.address = params.label;
+      }
+    }
+  ]
+]);
+
 function parseVcard(vcardArray: unknown): RdapContact {
   const contact: RdapContact = {
     name: null,
@@ -65,20 +116,7 @@ function parseVcard(vcardArray: unknown): RdapContact {
       continue;
     }
 
-    const propName = String(prop[0] ?? "");
-    const propValue = prop[3];
-    if (propName === "fn" && propValue) {
-      contact.name = propValue;
-    } else if (propName === "email" && propValue) {
-      contact.emails.push(propValue);
-    } else if (propName === "tel" && propValue) {
-      contact.phones.push(propValue);
-    } else if (propName === "adr") {
-      const params = asRecord(prop[1]);
-      if ("label" in params) {
-        contact.address = params.label;
-      }
-    }
+    vcardHandlers.get(String(prop[0]))?.(contact, prop);
   }
 
   contact.emails = uniqueValues(contact.emails);
@@ -106,32 +144,58 @@ function extractEmails(text: string): string[] {
   return [...text.matchAll(/[A-Z0-9._%+-]+@[A-Z0-9.-]+\.[A-Z]{2,}/gi)].map((match) => match[0]);
 }
 
-function parseWhoisAbuseContact(rpsl: string): { emails: string[]; handle: string | null } {
+interface WhoisAbuseContact {
+  emails: string[];
+  handle: string | null;
+}
+
+// Keyed by the cached WHOIS result object, so a cached reply is scanned once and entries go away with it.
+const parsedWhoisAbuse = new WeakMap<object, WhoisAbuseContact>();
+
+const abuseHeaderPattern = /^%\s*Abuse contact for .* is '([^']+)'/i;
+const abuseMailboxPattern = /^abuse-mailbox:\s*(\S+)/i;
+const abuseHandlePattern = /^abuse-c:\s*(\S+)/i;
+const irtHandlePattern = /^mnt-irt:\s*(\S+)/i;
+const abuseWordPattern = /\b(abuse|security)\b/i;
+
+// Single scan over the reply. The attribute patterns only run on lines whose first character can match them,
+// and each line's emails are extracted at most once.
+function parseWhoisAbuseContact(rpsl: string): WhoisAbuseContact {
   const emails: string[] = [];
   let handle: string | null = null;
   let previousLineWasAbuseRelated = false;
 
   for (const line of rpsl.split(/\r?\n/)) {
-    const abuseHeader = line.match(/^%\s*Abuse contact for .* is '([^']+)'/i);
-    if (abuseHeader?.[1]) {
-      emails.push(abuseHeader[1]);
-    }
-
-    const abuseMailbox = line.match(/^abuse-mailbox:\s*(\S+)/i);
-    if (abuseMailbox?.[1]) {
-      emails.push(abuseMailbox[1]);
-    }
-
-    const abuseHandle = line.match(/^abuse-c:\s*(\S+)/i) ?? line.match(/^mnt-irt:\s*(\S+)/i);
-    if (abuseHandle?.[1] && !handle) {
-      handle = abuseHandle[1];
+    const first = line.charCodeAt(0) | 0x20;
+    if (first === 0x25 /* % */) {
+      const abuseHeader = abuseHeaderPattern.exec(line);
+      if (abuseHeader?.[1]) {
+        emails.push(abuseHeader[1]);
+      }
+    } else if (first === 0x61 /* a */) {
+      const abuseMailbox = abuseMailboxPattern.exec(line);
+      if (abuseMailbox?.[1]) {
+        emails.push(abuseMailbox[1]);
+      }
+      const abuseHandle = abuseHandlePattern.exec(line);
+      if (abuseHandle?.[1] && !handle) {
+        handle = abuseHandle[1];
+      }
+    } else if (first === 0x6d /* m */) {
+      const irtHandle = irtHandlePattern.exec(line);
+      if (irtHandle?.[1] && !handle) {
+        handle = irtHandle[1];
+      }
     }
 
-    const lineIsAbuseRelated = /\b(abuse|security)\b/i.test(line);
+    const lineIsAbuseRelated = abuseWordPattern.test(line);
     if (lineIsAbuseRelated || previousLineWasAbuseRelated) {
-      emails.push(...extractEmails(line));
+      const lineEmails = extractEmails(line);
+      emails.push(...lineEmails);
+      previousLineWasAbuseRelated = lineIsAbuseRelated && lineEmails.length === 0;
+    } else {
+      previousLineWasAbuseRelated = false;
     }
-    previousLineWasAbuseRelated = lineIsAbuseRelated && extractEmails(line).length === 0;
   }
 
   return {
@@ -151,26 +215,27 @@ async function getWhoisAbuseContact(
   }
 
   const whoisQuery = queryType === "asn" ? `AS${queryValue}` : queryValue;
-  try {
-    const rpsl = await deps.whoisClient.query(rir.whois, `${whoisQuery}\r\n`, {
-      chunkSize: 8192,
-      readTimeoutReturnsPartial: true
-    });
-    const parsed = parseWhoisAbuseContact(rpsl);
-    if (parsed.emails.length === 0 && !parsed.handle) {
-      return null;
-    }
+  const lookup = await handleWhoisQuery(rir, { query: whoisQuery }, deps);
+  if (!lookup.ok) {
+    return null;
+  }
 
-    return {
-      name: `${rir.label} abuse contact`,
-      emails: parsed.emails,
-      phones: [],
-      address: null,
-      handle: parsed.handle
-    };
-  } catch {
+  let parsed = parsedWhoisAbuse.get(lookup.data);
+  if (parsed === undefined) {
+    parsed = parseWhoisAbuseContact(lookup.data.rpsl);
+    parsedWhoisAbuse.set(lookup.data, parsed);
+  }
+  if (parsed.emails.length === 0 && !parsed.handle) {
     return null;
   }
+
+  return {
+    name: `${rir.label} abuse contact`,
+    emails: parsed.emails,
+    phones: [],
+    address: null,
+    handle: parsed.handle
+  };
 }
 
 function mergeAbuseContact(primary: RdapContact | null, fallback: RdapContact | null): RdapContact | null {
@@ -191,51 +256,113 @@ function mergeAbuseContact(primary: RdapContact | null, fallback: RdapContact |
   };
 }
 
+interface RdapSummary {
+  orgName: unknown;
+  country: unknown;
+  handle: unknown;
+  abuseContact: RdapContact | null;
+  adminContacts: RdapContact[];
+  techContacts: RdapContact[];
+  registrantContact: RdapContact | null;
+}
+
+// Projects the RDAP reply down to the fields the contact card uses. Keeping the full tree local to this
+// function lets it be collected before the handler waits on the WHOIS fallback.
+async function fetchRdapSummary(url: string, deps: ToolDependencies): Promise<RdapSummary | null> {
+  const data = asRecord(await deps.httpClient.getJson(url, { notFoundValue: {} }));
+  if (Object.keys(data).length === 0 || !("objectClassName" in data)) {
+    return null;
+  }
+
+  let handle: unknown = data.handle ?? "";
+  let abuseContact: RdapContact | null = null;
+  const adminContacts: RdapContact[] = [];
+  const techContacts: RdapContact[] = [];
+  let registrantContact: RdapContact | null = null;
+
+  for (const entity of rdapEntities(data.entities)) {
+    const roles = new Set(asArray(entity.roles).map((role) => stringValue(role)));
+    handle = entity.handle ?? "";
+    const vcard = entity.vcardArray;
+    if (!vcard) {
+      continue;
+    }
+
+    const contact = parseVcard(vcard);
+    contact.handle = handle;
+
+    if (roles.has("abuse")) {
+      abuseContact = contact;
+    }
+    if (roles.has("administrative")) {
+      adminContacts.push(contact);
+    }
+    if (roles.has("technical")) {
+      techContacts.push(contact);
+    }
+    if (roles.has("registrant")) {
+      registrantContact = contact;
+    }
+  }
+
+  return {
+    orgName: data.name ?? "Unknown",
+    country: data.country ?? "Unknown",
+    handle,
+    abuseContact,
+    adminContacts,
+    techContacts,
+    registrantContact
+  };
+}
+
 export async function handleRdapContact(
   rir: RirConfig,
   args: ContactArgs,
   deps: ToolDependencies
 ): Promise<ToolResult<RdapContactData>> {
-  const label = labels[rir.id] ?? rir.label;
-  if (!rir.enabled) {
-    return {
-      ok: false,
-      error: "service_disabled",
-      detail: `${label} contact card support is disabled. Set ${rir.supportEnv}=true to enable.`
-    };
+  const providedParams = providedContactParams(args);
+  if (providedParams !== 1) {
+    return badContactParamsResult;
   }
 
-  const providedParams = [args.ip, args.asn, args.org].filter((value) => value !== undefined && value !== null).length;
-  if (providedParams !== 1) {
-    return {
-      ok: false,
-      error: "bad_request",
-      detail: "Provide exactly one of: ip, asn, or org"
-    };
+  // RDAP has no org lookup here; reject before touching the cache.
+  if (args.org) {
+    return orgNotSupportedResult;
   }
 
-  let cacheKey: string;
-  let queryType: string;
-  let queryValue: string | null | undefined;
-  if (args.ip) {
-    cacheKey = `${rir.id}:contact_ip:${args.ip}`;
-    queryType = "ip";
-    queryValue = args.ip;
-  } else if (args.asn !== undefined && args.asn !== null) {
-    cacheKey = `${rir.id}:contact_asn:${args.asn}`;
-    queryType = "asn";
-    queryValue = String(args.asn);
-  } else {
-    cacheKey = `${rir.id}:contact_org:${args.org}`;
-    queryType = "org";
-    queryValue = args.org;
+  // Bare addresses are checked locally so malformed input fails fast instead of costing an RDAP round-trip.
+  // IPv6 is lower-cased so differently-cased spellings share one cache entry.
+  if (args.ip && !args.ip.includes("/")) {
+    const family = isIP(args.ip);
+    if (family === 0) {
+      return {
+        ok: false,
+        error: "bad_request",
+        detail: `Invalid IP address: '${args.ip}'`
+      };
+    }
+    if (family === 6) {
+      args = { ...args, ip: args.ip.toLowerCase() };
+    }
   }
 
-  const cached = contactCache.get(cacheKey);
+  const { cacheKey, queryType, queryValue } = contactQuery(rir.id, args);
+
+  const cached = contactCache.get(cacheKey) as ToolResult<RdapContactData> | undefined;
   if (cached !== undefined) {
     return cached;
   }
 
+  return contactFlights.run(cacheKey, () => fetchRdapContact(rir, args, { cacheKey, queryType, queryValue }, deps));
+}
+
+async function fetchRdapContact(
+  rir: RirConfig,
+  args: ContactArgs,
+  { cacheKey, queryType, queryValue }: ContactQuery,
+  deps: ToolDependencies
+): Promise<ToolResult<RdapContactData>> {
   try {
     let url: string;
     if (args.ip) {
@@ -243,63 +370,23 @@ export async function handleRdapContact(
       url = `${rir.rdapBase}/ip/${rdapQuery}`;
     } else if (args.asn !== undefined && args.asn !== null) {
       url = `${rir.rdapBase}/autnum/${args.asn}`;
-    } else if (args.org) {
-      return {
-        ok: false,
-        error: "not_supported",
-        detail: "Direct organization queries are not supported. Please use an IP address or ASN instead."
-      };
     } else {
-      return {
-        ok: false,
-        error: "bad_request",
-        detail: "Internal error: no valid query parameter"
-      };
+      return noQueryParamResult;
     }
 
-    const data = asRecord(await deps.httpClient.getJson(url, { notFoundValue: {} }));
-    if (Object.keys(data).length === 0 || !("objectClassName" in data)) {
+    const summary = await fetchRdapSummary(url, deps);
+    if (summary === null) {
       const result: ToolResult<RdapContactData> = {
         ok: false,
         error: "not_found",
         detail: `No records found for ${queryType}='${queryValue}'`
       };
-      contactCache.set(cacheKey, result);
+      contactCache.set(cacheKey, result, NOT_FOUND_TTL_SECONDS);
       return result;
     }
 
-    const orgName = data.name ?? "Unknown";
-    const country = data.country ?? "Unknown";
-    let handle: unknown = data.handle ?? "";
-    let abuseContact: RdapContact | null = null;
-    const adminContacts: RdapContact[] = [];
-    const techContacts: RdapContact[] = [];
-    let registrantContact: RdapContact | null = null;
-
-    for (const entity of rdapEntities(data.entities)) {
-      const roles = asArray(entity.roles).map((role) => stringValue(role));
-      handle = entity.handle ?? "";
-      const vcard = entity.vcardArray;
-      if (!vcard) {
-        continue;
-      }
-
-      const contact = parseVcard(vcard);
-      contact.handle = handle;
-
-      if (roles.includes("abuse")) {
-        abuseContact = contact;
-      }
-      if (roles.includes("administrative")) {
-        adminContacts.push(contact);
-      }
-      if (roles.includes("technical")) {
-        techContacts.push(contact);
-      }
-      if (roles.includes("registrant")) {
-        registrantContact = contact;
-      }
-    }
+    const { orgName, country, handle, adminContacts, techContacts, registrantContact } = summary;
+    let abuseContact = summary.abuseContact;
 
     const whoisAbuseContact = await getWhoisAbuseContact(rir, queryType, queryValue, deps);
     if (whoisAbuseContact && (!hasEmail(abuseContact) || whoisAbuseContact.emails.length > 0)) {
@@ -341,11 +428,7 @@ export function registerRdapContactTool(server: McpServer, rir: RirConfig, deps:
     `${rir.id}_contact_card`,
     {
       description: `PREFERRED TOOL for retrieving contact information (abuse, NOC, admin, tech) for IP addresses, ASNs, or organizations from the ${label} database.`,
-      inputSchema: {
-        ip: z.string().nullable().optional().describe(`IP address to look up contact information for in ${label} database (IPv4 or IPv6)`),
-        asn: z.number().int().nullable().optional().describe(`ASN number to look up contact information for in ${label} database (without 'AS' prefix)`),
-        org: z.string().nullable().optional().describe("Organization handle/key to look up contact information for directly")
-      }
+      inputSchema: contactInputSchema(label)
     },
     async (args) => toMcpResult(await handleRdapContact(rir, args, deps))
   );
@@ -1,9 +1,11 @@
 import type { McpServer } from "@modelcontextprotocol/sdk/server/mcp.js";
 import * as z from "zod/v4";
 
-import { TTLCache } from "../../cache.js";
-import { RIPE_REST_BASE } from "../../config.js";
+import { asSetCache } from "../../cache.js";
+import { AS_SET_CONCURRENCY, RIPE_REST_BASE } from "../../config.js";
 import type { ToolDependencies } from "../../deps.js";
+import { parseAsnMember } from "../../lib/asn.js";
+import { mapWithConcurrency, SingleFlight } from "../../lib/concurrency.js";
 import { ripeAttrs, ripeObjects } from "../../lib/ripe-object.js";
 import { toMcpResult, type ToolResult } from "../../types.js";
 
@@ -14,63 +16,88 @@ interface AsSetData {
   status?: "not-found" | "empty" | "expanded";
 }
 
-const cache = new TTLCache<string, Set<number>>({
-  maxItems: 1000,
-  ttlSeconds: 300
-});
+interface Expansion {
+  asns: number[];
+  found: boolean;
+  layers: number;
+  complete: boolean;
+}
+
+// Direct members of each set are cached as well, as null when RIPE has no such object.
+const memberFlights = new SingleFlight<string, string[] | null>();
 
 async function getJson(deps: ToolDependencies, url: string): Promise<unknown> {
   return deps.httpClient.getJson(url, { notFoundValue: { objects: { object: [] } } });
 }
 
-async function expandRecursive(
-  setname: string,
-  seen: Set<string>,
-  outAsns: Set<number>,
-  foundSets: Set<string>,
-  deps: ToolDependencies,
-  depth = 0,
-  maxDepth = 10
-): Promise<void> {
-  if (depth >= maxDepth || seen.has(setname)) {
-    return;
+async function getMembers(setname: string, deps: ToolDependencies): Promise<string[] | null> {
+  const cacheKey = `ripe:as_set_members:${setname}`;
+  const cached = asSetCache.get(cacheKey) as string[] | null | undefined;
+  if (cached !== undefined) {
+    return cached;
   }
-  seen.add(setname);
 
-  const cacheKey = `as_set:${setname}`;
-  const cached = cache.get(cacheKey);
-  if (cached !== undefined && cached.size > 0) {
-    for (const asn of cached) {
-      outAsns.add(asn);
+  // Concurrent expansions that reach the same set before it is cached share one fetch.
+  return memberFlights.run(cacheKey, async () => {
+    const objects = ripeObjects(await getJson(deps, `${RIPE_REST_BASE}/ripe/as-set/${setname}.json`));
+    const members = objects.length === 0 ? null : ripeAttrs(objects[0], "members");
+    asSetCache.set(cacheKey, members);
+    return members;
+  });
+}
+
+// Same layered walk as the ARIN tool: every unseen nested set in a layer is fetched concurrently.
+async function expandLayers(root: string, deps: ToolDependencies, maxDepth: number): Promise<Expansion> {
+  const asns = new Set<number>();
+  const seen = new Set<string>([root.toUpperCase()]);
+  let frontier = [root];
+  let truncated = false;
+  let found = false;
+  let depth = 0;
+
+  for (; depth < maxDepth && frontier.length > 0; depth++) {
+    // A failure on the root set is the caller's error; a failing nested set is skipped like a missing one.
+    const layer = await mapWithConcurrency(frontier, AS_SET_CONCURRENCY, (setname) =>
+      depth === 0 ? getMembers(setname, deps) : getMembers(setname, deps).catch(() => null)
+    );
+    if (depth === 0) {
+      found = layer[0] !== null;
     }
-    foundSets.add(setname);
-    return;
-  }
 
-  const objects = ripeObjects(await getJson(deps, `${RIPE_REST_BASE}/ripe/as-set/${setname}.json`));
-  if (objects.length === 0) {
-    return;
-  }
+    const lastLayer = depth + 1 >= maxDepth;
+    const next: string[] = [];
+    for (const members of layer) {
+      for (const memberRaw of members ?? []) {
+        const asn = parseAsnMember(memberRaw);
+        if (asn !== null) {
+          asns.add(asn);
+          continue;
+        }
 
-  foundSets.add(setname);
-  const asns = new Set<number>();
-  for (const memberRaw of ripeAttrs(objects[0], "members")) {
-    const member = memberRaw.toUpperCase();
-    if (member.startsWith("AS") && /^\d+$/.test(member.slice(2))) {
-      asns.add(Number.parseInt(member.slice(2), 10));
-    } else if (member.startsWith("AS-")) {
-      try {
-        await expandRecursive(memberRaw, seen, asns, foundSets, deps, depth + 1, maxDepth);
-      } catch {
-        // Match Python behavior: continue when one nested AS-SET fails.
+        const member = memberRaw.toUpperCase();
+        if (member.startsWith("AS-") && !seen.has(member)) {
+          // Sets found on the last allowed layer are never fetched; just note that the walk was cut short.
+          if (lastLayer) {
+            truncated = true;
+            continue;
+          }
+          seen.add(member);
+          next.push(memberRaw);
+        }
       }
     }
+    frontier = next;
   }
 
-  cache.set(cacheKey, asns);
-  for (const asn of asns) {
-    outAsns.add(asn);
+  return { asns: [...asns].sort((a, b) => a - b), found, layers: depth, complete: !truncated && frontier.length === 0 };
+}
+
+function cachedExpansion(setname: string, maxDepth: number): Expansion | undefined {
+  const complete = asSetCache.get(`ripe:as_set:${setname}`) as Expansion | undefined;
+  if (complete !== undefined && complete.layers <= maxDepth) {
+    return complete;
   }
+  return asSetCache.get(`ripe:as_set:${setname}:depth_${maxDepth}`) as Expansion | undefined;
 }
 
 export async function handleRipeAsSet(
@@ -78,26 +105,21 @@ export async function handleRipeAsSet(
   deps: ToolDependencies
 ): Promise<ToolResult<AsSetData>> {
   const maxDepth = args.max_depth ?? 10;
-  const cacheKey = `as_set:${args.setname}`;
-  const cached = cache.get(cacheKey);
+  const cached = cachedExpansion(args.setname, maxDepth);
   if (cached !== undefined) {
     return {
       ok: true,
       data: {
         as_set: args.setname,
-        asns: [...cached].sort((a, b) => a - b),
-        count: cached.size
+        asns: cached.asns,
+        count: cached.asns.length
       }
     };
   }
 
   try {
-    const seen = new Set<string>();
-    const asns = new Set<number>();
-    const foundSets = new Set<string>();
-    await expandRecursive(args.setname, seen, asns, foundSets, deps, 0, maxDepth);
-
-    if (!foundSets.has(args.setname)) {
+    const expansion = await expandLayers(args.setname, deps, maxDepth);
+    if (!expansion.found) {
       return {
         ok: true,
         data: {
@@ -109,7 +131,12 @@ export async function handleRipeAsSet(
       };
     }
 
-    if (asns.size === 0) {
+    asSetCache.set(
+      expansion.complete ? `ripe:as_set:${args.setname}` : `ripe:as_set:${args.setname}:depth_${maxDepth}`,
+      expansion
+    );
+
+    if (expansion.asns.length === 0) {
       return {
         ok: true,
         data: {
@@ -125,8 +152,8 @@ export async function handleRipeAsSet(
       ok: true,
       data: {
         as_set: args.setname,
-        asns: [...asns].sort((a, b) => a - b),
-        count: asns.size,
+        asns: expansion.asns,
+        count: expansion.asns.length,
         status: "expanded"
       }
     };
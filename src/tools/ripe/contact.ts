@@ -1,12 +1,19 @@
 import type { McpServer } from "@modelcontextprotocol/sdk/server/mcp.js";
-import * as z from "zod/v4";
 
-import { TTLCache } from "../../cache.js";
-import { RIRS } from "../../config.js";
+import { contactCache, contactFlights, NOT_FOUND_TTL_SECONDS, TTLCache } from "../../cache.js";
+import { RIPE_CONTACT_CONCURRENCY, RIRS } from "../../config.js";
 import type { ToolDependencies } from "../../deps.js";
-import { ripeAttrs, ripeObjects } from "../../lib/ripe-object.js";
+import { mapWithConcurrency, SingleFlight } from "../../lib/concurrency.js";
+import { ripeAttrIndex, ripeAttrs, ripeObjects } from "../../lib/ripe-object.js";
 import { toMcpResult, type ToolResult } from "../../types.js";
-import type { ContactArgs } from "../rdap-contact.js";
+import {
+  badContactParamsResult,
+  contactInputSchema,
+  contactQuery,
+  providedContactParams,
+  type ContactArgs,
+  type ContactQuery
+} from "../contact-args.js";
 
 interface RipeContactData {
   query: { type: string; value: string | null | undefined };
@@ -21,64 +28,108 @@ interface RipeContactData {
   tech_contacts: unknown[];
 }
 
-const cache = new TTLCache<string, ToolResult<RipeContactData>>({
-  maxItems: 500,
-  ttlSeconds: 600
+// Stale person/role handles are referenced by many organisations, so URLs that just returned 404 are remembered
+// briefly instead of being requested again for every card that mentions them.
+const notFoundUrls = new TTLCache<string, true>({
+  maxItems: 5000,
+  ttlSeconds: NOT_FOUND_TTL_SECONDS
 });
 
+// Returned by identity on a 404 so getRipeJson can tell a missing object from an empty search result.
+const ripeNotFound = { objects: { object: [] } };
+
 async function getRipeJson(deps: ToolDependencies, url: string): Promise<unknown> {
-  return deps.httpClient.getJson(url, { notFoundValue: { objects: { object: [] } } });
+  if (notFoundUrls.get(url)) {
+    return ripeNotFound;
+  }
+
+  const data = await deps.httpClient.getJson(url, { notFoundValue: ripeNotFound });
+  if (data === ripeNotFound) {
+    notFoundUrls.set(url, true);
+  }
+  return data;
 }
 
 function uniqueStrings(values: string[]): string[] {
   return [...new Set(values.filter(Boolean))];
 }
 
-async function getRipeObject(deps: ToolDependencies, handle: string, preferredType: "person" | "role"): Promise<unknown | null> {
-  const objectTypes = preferredType === "person" ? ["person", "role"] : ["role", "person"];
-  for (const objectType of objectTypes) {
-    const objects = ripeObjects(await getRipeJson(deps, `${RIRS.ripe.restBase}/ripe/${objectType}/${handle}.json`));
-    if (objects.length > 0) {
-      return objects[0];
-    }
+function contactEmails(attrs: Map<string, string[]>): string[] {
+  return uniqueStrings([...(attrs.get("e-mail") ?? []), ...(attrs.get("abuse-mailbox") ?? [])]);
+}
+
+interface RipeContactDetails {
+  person: string | null;
+  role: string | null;
+  emails: string[];
+  phones: string[];
+  remarks: string[];
+}
+
+// The same staff handles appear under many organisations, so the fields a card needs from each person/role
+// object are cached on their own, keyed by the lookup order because that decides which object wins.
+const contactDetailsCache = new TTLCache<string, RipeContactDetails>({
+  maxItems: 5000,
+  ttlSeconds: 600
+});
+const contactDetailsFlights = new SingleFlight<string, RipeContactDetails | null>();
+
+async function getContactDetails(
+  deps: ToolDependencies,
+  handle: string,
+  preferredType: "person" | "role"
+): Promise<RipeContactDetails | null> {
+  const cacheKey = `${preferredType}:${handle}`;
+  const cached = contactDetailsCache.get(cacheKey);
+  if (cached !== undefined) {
+    return cached;
   }
 
-  return null;
+  // Cards for different organisations that reach the same uncached handle at once share one fetch.
+  return contactDetailsFlights.run(cacheKey, async () => {
+    const objectTypes = preferredType === "person" ? ["person", "role"] : ["role", "person"];
+    for (const objectType of objectTypes) {
+      const objects = ripeObjects(await getRipeJson(deps, `${RIRS.ripe.restBase}/ripe/${objectType}/${handle}.json`));
+      if (objects.length > 0) {
+        const attrs = ripeAttrIndex(objects[0]);
+        const details = {
+          person: attrs.get("person")?.[0] ?? null,
+          role: attrs.get("role")?.[0] ?? null,
+          emails: contactEmails(attrs),
+          phones: attrs.get("phone") ?? [],
+          remarks: attrs.get("remarks") ?? []
+        };
+        contactDetailsCache.set(cacheKey, details);
+        return details;
+      }
+    }
+
+    return null;
+  });
 }
 
 export async function handleRipeContact(args: ContactArgs, deps: ToolDependencies): Promise<ToolResult<RipeContactData>> {
-  const rir = RIRS.ripe;
-  const providedParams = [args.ip, args.asn, args.org].filter((value) => value !== undefined && value !== null).length;
+  const providedParams = providedContactParams(args);
   if (providedParams !== 1) {
-    return {
-      ok: false,
-      error: "bad_request",
-      detail: "Provide exactly one of: ip, asn, or org"
-    };
+    return badContactParamsResult;
   }
 
-  let cacheKey: string;
-  let queryType: string;
-  let queryValue: string | null | undefined;
-  if (args.ip) {
-    cacheKey = `contact_ip:${args.ip}`;
-    queryType = "ip";
-    queryValue = args.ip;
-  } else if (args.asn !== undefined && args.asn !== null) {
-    cacheKey = `contact_asn:${args.asn}`;
-    queryType = "asn";
-    queryValue = String(args.asn);
-  } else {
-    cacheKey = `contact_org:${args.org}`;
-    queryType = "org";
-    queryValue = args.org;
-  }
+  const { cacheKey, queryType, queryValue } = contactQuery("ripe", args);
 
-  const cached = cache.get(cacheKey);
+  const cached = contactCache.get(cacheKey) as ToolResult<RipeContactData> | undefined;
   if (cached !== undefined) {
     return cached;
   }
 
+  return contactFlights.run(cacheKey, () => fetchRipeContact(args, { cacheKey, queryType, queryValue }, deps));
+}
+
+async function fetchRipeContact(
+  args: ContactArgs,
+  { cacheKey, queryType, queryValue }: ContactQuery,
+  deps: ToolDependencies
+): Promise<ToolResult<RipeContactData>> {
+  const rir = RIRS.ripe;
   try {
     let orgKey = args.org;
     if (!orgKey) {
@@ -97,7 +148,7 @@ export async function handleRipeContact(args: ContactArgs, deps: ToolDependencie
           error: "not_found",
           detail: `No records found for ${queryType}='${queryValue}'`
         };
-        cache.set(cacheKey, result);
+        contactCache.set(cacheKey, result, NOT_FOUND_TTL_SECONDS);
         return result;
       }
 
@@ -116,7 +167,7 @@ export async function handleRipeContact(args: ContactArgs, deps: ToolDependencie
           error: "no_organisation",
           detail: `No organization found for ${queryType}='${queryValue}'`
         };
-        cache.set(cacheKey, result);
+        contactCache.set(cacheKey, result);
         return result;
       }
     }
@@ -128,56 +179,47 @@ export async function handleRipeContact(args: ContactArgs, deps: ToolDependencie
         error: "org_not_found",
         detail: `Organization '${orgKey}' not found`
       };
-      cache.set(cacheKey, result);
+      contactCache.set(cacheKey, result, NOT_FOUND_TTL_SECONDS);
       return result;
     }
 
-    const orgObj = orgObjects[0];
-    const orgName = ripeAttrs(orgObj, "org-name")[0] ?? null;
-    const country = ripeAttrs(orgObj, "country")[0] ?? null;
-    const remarks = ripeAttrs(orgObj, "remarks");
-    const abuseC = ripeAttrs(orgObj, "abuse-c")[0] ?? null;
+    // Index the organisation's attributes once instead of rescanning them for every field below.
+    const orgAttrs = ripeAttrIndex(orgObjects[0]);
+    const orgName = orgAttrs.get("org-name")?.[0] ?? null;
+    const country = orgAttrs.get("country")?.[0] ?? null;
+    const remarks = orgAttrs.get("remarks") ?? [];
+    const abuseC = orgAttrs.get("abuse-c")?.[0] ?? null;
     let abuseInfo: unknown = null;
+    const adminContacts: unknown[] = [];
+    const techContacts: unknown[] = [];
 
-    if (abuseC) {
-      try {
-        const abuseObj = await getRipeObject(deps, abuseC, "role");
-        if (abuseObj) {
-          abuseInfo = {
-            handle: abuseC,
-            role: ripeAttrs(abuseObj, "role")[0] ?? null,
-            emails: uniqueStrings([...ripeAttrs(abuseObj, "e-mail"), ...ripeAttrs(abuseObj, "abuse-mailbox")]),
-            phones: ripeAttrs(abuseObj, "phone"),
-            remarks: ripeAttrs(abuseObj, "remarks")
-          };
-        }
-      } catch {
-        abuseInfo = null;
+    // The abuse, admin and tech objects are independent, so fetch them together and assemble in attribute order.
+    // A failed lookup only drops that one contact.
+    const lookups: Array<{ kind: "abuse" | "admin" | "tech"; handle: string; preferredType: "person" | "role" }> = [
+      ...(abuseC ? [{ kind: "abuse" as const, handle: abuseC, preferredType: "role" as const }] : []),
+      ...(orgAttrs.get("admin-c") ?? []).map((handle) => ({ kind: "admin" as const, handle, preferredType: "person" as const })),
+      ...(orgAttrs.get("tech-c") ?? []).map((handle) => ({ kind: "tech" as const, handle, preferredType: "person" as const }))
+    ];
+    const contacts = await mapWithConcurrency(lookups, RIPE_CONTACT_CONCURRENCY, (lookup) =>
+      getContactDetails(deps, lookup.handle, lookup.preferredType).catch(() => null)
+    );
+
+    for (const [index, { kind, handle }] of lookups.entries()) {
+      const contact = contacts[index];
+      if (!contact) {
+        continue;
       }
-    }
 
-    const adminContacts: unknown[] = [];
-    const techContacts: unknown[] = [];
-    for (const [contactType, target] of [
-      ["admin-c", adminContacts],
-      ["tech-c", techContacts]
-    ] as const) {
-      for (const handle of ripeAttrs(orgObj, contactType)) {
-        try {
-          const contactObj = await getRipeObject(deps, handle, "person");
-          if (contactObj) {
-            target.push({
-              handle,
-              person: ripeAttrs(contactObj, "person")[0] ?? null,
-              role: ripeAttrs(contactObj, "role")[0] ?? null,
-              emails: uniqueStrings([...ripeAttrs(contactObj, "e-mail"), ...ripeAttrs(contactObj, "abuse-mailbox")]),
-              phones: ripeAttrs(contactObj, "phone"),
-              remarks: ripeAttrs(contactObj, "remarks")
-            });
-          }
-        } catch {
-          // Match Python behavior: ignore individual contact lookup failures.
-        }
+      if (kind === "abuse") {
+        abuseInfo = {
+          handle,
+          role: contact.role,
+          emails: contact.emails,
+          phones: contact.phones,
+          remarks: contact.remarks
+        };
+      } else {
+        (kind === "admin" ? adminContacts : techContacts).push({ handle, ...contact });
       }
     }
 
@@ -196,7 +238,7 @@ export async function handleRipeContact(args: ContactArgs, deps: ToolDependencie
         tech_contacts: techContacts
       }
     };
-    cache.set(cacheKey, result);
+    contactCache.set(cacheKey, result);
     return result;
   } catch (error) {
     return {
@@ -213,11 +255,7 @@ export function registerRipeContactTool(server: McpServer, deps: ToolDependencie
     {
       description:
         "PREFERRED TOOL for retrieving contact information (abuse, NOC, admin, tech) for IP addresses, ASNs, or organizations from the RIPE NCC database.",
-      inputSchema: {
-        ip: z.string().nullable().optional().describe("IP address to look up contact information for in RIPE database (IPv4 or IPv6)"),
-        asn: z.number().int().nullable().optional().describe("ASN number to look up contact information for in RIPE database (without 'AS' prefix)"),
-        org: z.string().nullable().optional().describe("Organization handle/key to look up contact information for directly")
-      }
+      inputSchema: contactInputSchema("RIPE")
     },
     async (args) => toMcpResult(await handleRipeContact(args, deps))
   );
@@ -1,9 +1,11 @@
 import type { McpServer } from "@modelcontextprotocol/sdk/server/mcp.js";
 import * as z from "zod/v4";
 
-import { TTLCache } from "../../cache.js";
+import { ROUTE_EXISTS_TTL_SECONDS, TTLCache } from "../../cache.js";
+import { persistCache } from "../../cache-snapshot.js";
 import { RIPE_REST_BASE } from "../../config.js";
 import type { ToolDependencies } from "../../deps.js";
+import { parseAsnMember } from "../../lib/asn.js";
 import { HttpStatusError } from "../../lib/http.js";
 import { validateIpPrefix } from "../../lib/prefix.js";
 import { ripeObjects } from "../../lib/ripe-object.js";
@@ -26,22 +28,25 @@ const cache = new TTLCache<string, ToolResult<RouteData>>({
   maxItems: 1000,
   ttlSeconds: 300
 });
+persistCache("ripe_route", cache);
 
-async function searchRoute(prefix: string, deps: ToolDependencies): Promise<{ data: unknown; routeType: string }> {
-  const routeType = prefix.includes(":") ? "route6" : "route";
-  const url = `${RIPE_REST_BASE}/search.json?query-string=${prefix}&type-filter=${routeType}`;
+async function searchRoute(
+  prefix: string,
+  version: 4 | 6,
+  deps: ToolDependencies
+): Promise<{ data: unknown; routeType: string }> {
+  const routeType = version === 6 ? "route6" : "route";
+  // Only the route objects themselves are read, so skip the referenced contact and irt objects RIPE would
+  // otherwise attach to every match.
+  const url = `${RIPE_REST_BASE}/search.json?query-string=${prefix}&type-filter=${routeType}&flags=no-referenced&flags=no-irt`;
   return { data: await deps.httpClient.getJson(url), routeType };
 }
 
 export async function handleRipeRoute(args: RouteArgs, deps: ToolDependencies): Promise<ToolResult<RouteData>> {
-  const cacheKey = `route:${args.prefix}|${args.origin_asn}`;
-  const cached = cache.get(cacheKey);
-  if (cached !== undefined) {
-    return cached;
-  }
-
+  // Validate first so malformed prefixes never reach the cache, then key IPv6 case-insensitively.
+  let version: 4 | 6;
   try {
-    validateIpPrefix(args.prefix);
+    version = validateIpPrefix(args.prefix);
   } catch (error) {
     return {
       ok: false,
@@ -50,20 +55,36 @@ export async function handleRipeRoute(args: RouteArgs, deps: ToolDependencies):
     };
   }
 
+  const cacheKey = `route:${version === 6 ? args.prefix.toLowerCase() : args.prefix}|${args.origin_asn}`;
+  const cached = cache.get(cacheKey);
+  if (cached !== undefined) {
+    return cached;
+  }
+
   try {
-    const { data, routeType } = await searchRoute(args.prefix, deps);
+    const { data, routeType } = await searchRoute(args.prefix, version, deps);
     const matches: Array<{ route: string; origin: string; source: string }> = [];
 
     for (const obj of ripeObjects(data)) {
-      const attrs = asArray(asRecord(asRecord(obj).attributes).attribute).map(asRecord);
-      const route = stringValue(attrs.find((attr) => attr.name === "route" || attr.name === "route6")?.value);
-      const origin = stringValue(attrs.find((attr) => attr.name === "origin")?.value);
+      // One walk over the attributes picks up both fields and stops once it has them; the first values win.
+      let route = "";
+      let origin = "";
+      for (const rawAttr of asArray(asRecord(asRecord(obj).attributes).attribute)) {
+        const attr = asRecord(rawAttr);
+        if (!route && (attr.name === "route" || attr.name === "route6")) {
+          route = stringValue(attr.value);
+        } else if (!origin && attr.name === "origin") {
+          origin = stringValue(attr.value);
+        }
+        if (route && origin) {
+          break;
+        }
+      }
       if (!route) {
         continue;
       }
 
-      const originNum = Number.parseInt(origin.toUpperCase().replace("AS", ""), 10);
-      if (!Number.isNaN(originNum) && originNum === args.origin_asn) {
+      if (parseAsnMember(origin.trim()) === args.origin_asn) {
         matches.push({
           route,
           origin,
@@ -81,7 +102,7 @@ export async function handleRipeRoute(args: RouteArgs, deps: ToolDependencies):
         origin_asn: args.origin_asn
       }
     };
-    cache.set(cacheKey, result);
+    cache.set(cacheKey, result, matches.length > 0 ? ROUTE_EXISTS_TTL_SECONDS : undefined);
     return result;
   } catch (error) {
     if (error instanceof HttpStatusError && error.status === 404) {
@@ -2,10 +2,12 @@ import type { McpServer } from "@modelcontextprotocol/sdk/server/mcp.js";
 import * as z from "zod/v4";
 
 import { TTLCache } from "../cache.js";
+import { persistCache } from "../cache-snapshot.js";
 import type { RirConfig, RirId } from "../config.js";
-import { RIRS } from "../config.js";
+import { RIRS, WHOIS_CACHE_MAX_BYTES } from "../config.js";
 import type { ToolDependencies } from "../deps.js";
-import { WhoisTimeoutError } from "../lib/whois-client.js";
+import { SingleFlight } from "../lib/concurrency.js";
+import { WhoisResponseTooLargeError, WhoisTimeoutError, type WhoisQueryOptions } from "../lib/whois-client.js";
 import { toMcpResult, type ToolResult } from "../types.js";
 
 interface WhoisArgs {
@@ -19,10 +21,34 @@ interface WhoisData {
   latency_ms: number;
 }
 
+// RPSL replies range from a few hundred bytes to megabytes, so the cache is bounded by text size as well as
+// entry count. String length stands in for bytes; RPSL is almost entirely ASCII.
 const whoisCache = new TTLCache<string, ToolResult<WhoisData>>({
   maxItems: 1000,
-  ttlSeconds: 300
+  ttlSeconds: 300,
+  maxBytes: WHOIS_CACHE_MAX_BYTES,
+  sizeOf: (result) => (result.ok ? result.data.rpsl.length : 0)
 });
+persistCache("whois", whoisCache);
+
+const ripeQueryOptions: WhoisQueryOptions = {
+  chunkSize: 65536,
+  readTimeoutReturnsPartial: false
+};
+
+const defaultQueryOptions: WhoisQueryOptions = {
+  chunkSize: 8192,
+  readTimeoutReturnsPartial: true
+};
+
+// Failures are remembered briefly so an unreachable server is not re-dialled on every repeated query.
+const whoisErrorCache = new TTLCache<string, ToolResult<WhoisData>>({
+  maxItems: 256,
+  ttlSeconds: 10
+});
+
+// Identical queries that miss both caches at the same moment share one connection instead of each dialling out.
+const whoisFlights = new SingleFlight<string, ToolResult<WhoisData>>();
 
 const whoisDescriptions: Record<RirId, { tool: string; query: string; flags: string }> = {
   ripe: {
@@ -67,9 +93,32 @@ const whoisDescriptions: Record<RirId, { tool: string; query: string; flags: str
   }
 };
 
-function cacheKey(rir: RirConfig, query: string, flags: string[]): string {
-  const prefix = rir.id === "ripe" ? "" : `${rir.id}:`;
-  return `${prefix}${query}|${flags.join(",")}`;
+const asnQueryPattern = /^AS\d+$/i;
+// The first segment must start with a letter, so dashed numeric ranges such as 64496-64511 keep the default TTL.
+const handleQueryPattern = /^[A-Z][A-Z0-9]*(?:-[A-Z0-9]+)+$/;
+
+// How long a reply stays cached depends on what was asked for: aut-num objects change over days, person, role
+// and other upper-case handles over weeks to months, while address lookups and free-form queries keep the
+// five-minute default because allocations and assignments under them move fastest. Any flag can turn the query
+// into an inverse or type-restricted lookup (-i origin AS3333, -T route AS-FOO) that moves just as fast, so
+// flagged queries always keep the default.
+function whoisTtlSeconds(query: string, flags: string[]): number | undefined {
+  if (flags.length > 0) {
+    return undefined;
+  }
+  if (asnQueryPattern.test(query)) {
+    return 1800;
+  }
+  if (handleQueryPattern.test(query)) {
+    return 900;
+  }
+  return undefined;
+}
+
+// The wire line already encodes query and flags, so it doubles as the cache key. Flag lists that
+// serialise to the same line share one entry.
+function cacheKey(rir: RirConfig, line: string): string {
+  return `${rir.whois.server}:${rir.whois.port}:${line}`;
 }
 
 export async function handleWhoisQuery(
@@ -77,29 +126,29 @@ export async function handleWhoisQuery(
   args: WhoisArgs,
   deps: ToolDependencies
 ): Promise<ToolResult<WhoisData>> {
-  if (!rir.enabled) {
-    return {
-      ok: false,
-      error: "service_disabled",
-      detail: `${rir.label} WHOIS support is disabled. Set ${rir.supportEnv}=true to enable.`
-    };
-  }
-
   const flags = args.flags ?? [];
-  const key = cacheKey(rir, args.query, flags);
-  const cached = whoisCache.get(key);
+  // Joining the flags on their own avoids copying them into a scratch array just to append the query.
+  const line = flags.length === 0 ? `${args.query.trim()}\r\n` : `${(flags.join(" ") + " " + args.query).trim()}\r\n`;
+  const key = cacheKey(rir, line);
+  const cached = whoisCache.get(key) ?? whoisErrorCache.get(key);
   if (cached !== undefined) {
     return cached;
   }
 
-  const line = `${[...flags, args.query].join(" ").trim()}\r\n`;
+  return whoisFlights.run(key, () => queryWhois(rir, line, key, whoisTtlSeconds(args.query.trim(), flags), deps));
+}
+
+async function queryWhois(
+  rir: RirConfig,
+  line: string,
+  key: string,
+  ttlSeconds: number | undefined,
+  deps: ToolDependencies
+): Promise<ToolResult<WhoisData>> {
   const started = performance.now();
 
   try {
-    const rpsl = await deps.whoisClient.query(rir.whois, line, {
-      chunkSize: rir.id === "ripe" ? 65536 : 8192,
-      readTimeoutReturnsPartial: rir.id !== "ripe"
-    });
+    const rpsl = await deps.whoisClient.query(rir.whois, line, rir.id === "ripe" ? ripeQueryOptions : defaultQueryOptions);
     const result: ToolResult<WhoisData> = {
       ok: true,
       data: {
@@ -108,31 +157,48 @@ export async function handleWhoisQuery(
         latency_ms: Math.trunc(performance.now() - started)
       }
     };
-    whoisCache.set(key, result);
+    whoisCache.set(key, result, ttlSeconds);
     return result;
   } catch (error) {
-    if (error instanceof WhoisTimeoutError) {
-      return {
-        ok: false,
-        error: "timeout_error",
-        detail: "Connection or read timeout"
-      };
+    const result = whoisErrorResult(rir, error);
+    // An oversized reply is a property of the object, not a transient outage, so it is not cached at all.
+    if (!(error instanceof WhoisResponseTooLargeError)) {
+      whoisErrorCache.set(key, result);
     }
+    return result;
+  }
+}
 
-    if (error instanceof Error) {
-      return {
-        ok: false,
-        error: rir.id === "ripe" ? "network_error" : "network_error",
-        detail: `Network connection failed: ${error.message}`
-      };
-    }
+function whoisErrorResult(rir: RirConfig, error: unknown): ToolResult<WhoisData> {
+  if (error instanceof WhoisResponseTooLargeError) {
+    return {
+      ok: false,
+      error: "response_too_large",
+      detail: error.message
+    };
+  }
 
+  if (error instanceof WhoisTimeoutError) {
     return {
       ok: false,
-      error: rir.id === "ripe" ? "whois_error" : "internal_error",
-      detail: String(error)
+      error: "timeout_error",
+      detail: "Connection or read timeout"
     };
   }
+
+  if (error instanceof Error) {
+    return {
+      ok: false,
+      error: rir.id === "ripe" ? "network_error" : "network_error",
+      detail: `Network connection failed: ${error.message}`
+    };
+  }
+
+  return {
+    ok: false,
+    error: rir.id === "ripe" ? "whois_error" : "internal_error",
+    detail: String(error)
+  };
 }
 
 export function registerWhoisTool(server: McpServer, rir: RirConfig, deps: ToolDependencies): void {
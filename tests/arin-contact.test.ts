@@ -111,4 +111,23 @@ describe("ARIN contact tool", () => {
       }
     });
   });
+
+  it("reuses cached POC details across networks that share a POC", async () => {
+    const deps = fakeDeps();
+    const net = {
+      net: {
+        orgRef: { "@handle": "SHARED", "@name": "Shared POC Org" },
+        pocLinks: { pocLinkRef: { "@handle": "SHARED-ABUSE", "@function": "AB" } }
+      }
+    };
+    deps.httpClient.set(`${ARIN_REST_BASE}/ip/192.0.2.10`, net);
+    deps.httpClient.set(`${ARIN_REST_BASE}/ip/192.0.2.20`, net);
+    deps.httpClient.set(`${ARIN_REST_BASE}/poc/SHARED-ABUSE`, arinPocAbuse);
+
+    await handleArinContact({ ip: "192.0.2.10" }, deps);
+    const result = await handleArinContact({ ip: "192.0.2.20" }, deps);
+
+    expect(result).toMatchObject({ ok: true, data: { abuse: { handle: "SHARED-ABUSE" } } });
+    expect(deps.httpClient.calls.filter((call) => call.url.endsWith("/poc/SHARED-ABUSE"))).toHaveLength(1);
+  });
 });
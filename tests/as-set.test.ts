@@ -55,4 +55,43 @@ describe("AS-SET expansion tools", () => {
       }
     });
   });
+
+  it("expands nested ARIN AS-SETs layer by layer and skips cycles", async () => {
+    const deps = fakeDeps();
+    deps.httpClient.set(`${ARIN_REST_BASE}/irr/as-set/AS-ARIN-ROOT`, { members: ["AS64500", "AS-ARIN-A", "AS-ARIN-B"] });
+    deps.httpClient.set(`${ARIN_REST_BASE}/irr/as-set/AS-ARIN-A`, { members: "AS64501, AS-ARIN-ROOT" });
+    deps.httpClient.set(`${ARIN_REST_BASE}/irr/as-set/AS-ARIN-B`, { members: ["AS64502", "AS-ARIN-A"] });
+
+    await expect(handleArinAsSet({ setname: "AS-ARIN-ROOT", max_depth: 10 }, deps)).resolves.toEqual({
+      ok: true,
+      data: {
+        as_set: "AS-ARIN-ROOT",
+        asns: [64500, 64501, 64502],
+        count: 3,
+        status: "expanded"
+      }
+    });
+    expect(deps.httpClient.calls).toHaveLength(3);
+  });
+
+  it("answers deeper ARIN requests from a complete shallower expansion", async () => {
+    const deps = fakeDeps();
+    deps.httpClient.set(`${ARIN_REST_BASE}/irr/as-set/AS-ARIN-FLAT`, { members: ["AS64510", "AS64511"] });
+
+    await handleArinAsSet({ setname: "AS-ARIN-FLAT", max_depth: 2 }, deps);
+    const result = await handleArinAsSet({ setname: "AS-ARIN-FLAT", max_depth: 10 }, deps);
+
+    expect(result).toMatchObject({ ok: true, data: { asns: [64510, 64511], count: 2 } });
+    expect(deps.httpClient.calls).toHaveLength(1);
+  });
+
+  it("does not refetch a lower-case ARIN root that its members point back at", async () => {
+    const deps = fakeDeps();
+    deps.httpClient.set(`${ARIN_REST_BASE}/irr/as-set/as-arin-lower`, { members: ["AS64520", "AS-ARIN-LOWER"] });
+
+    const result = await handleArinAsSet({ setname: "as-arin-lower", max_depth: 10 }, deps);
+
+    expect(result).toMatchObject({ ok: true, data: { asns: [64520], count: 1 } });
+    expect(deps.httpClient.calls).toHaveLength(1);
+  });
 });
@@ -0,0 +1,17 @@
+import { describe, expect, it } from "vitest";
+
+import { parseAsnMember } from "../src/lib/asn.js";
+
+describe("parseAsnMember", () => {
+  it.each([
+    ["AS64496", 64496],
+    ["as4200000000", 4200000000],
+    ["As0", 0]
+  ])("parses %s", (member, asn) => {
+    expect(parseAsnMember(member)).toBe(asn);
+  });
+
+  it.each(["AS", "AS-FOO", "AS64496x", "ASN64496", "64496", "BS1", " AS1"])("rejects %s", (member) => {
+    expect(parseAsnMember(member)).toBeNull();
+  });
+});
@@ -27,4 +27,88 @@ describe("TTLCache", () => {
       vi.useRealTimers();
     }
   });
+
+  it("lets individual entries override the TTL", () => {
+    vi.useFakeTimers();
+    try {
+      const cache = new TTLCache<string, string>({ maxItems: 2, ttlSeconds: 10 });
+      cache.set("short", "1", 1);
+      cache.set("default", "2");
+      vi.advanceTimersByTime(1001);
+      expect(cache.get("short")).toBeUndefined();
+      expect(cache.get("default")).toBe("2");
+    } finally {
+      vi.useRealTimers();
+    }
+  });
+
+  it("keeps frequently read entries over one-off keys when admission is enabled", () => {
+    const cache = new TTLCache<string, string>({ maxItems: 2, ttlSeconds: 60, admission: true });
+    cache.set("a", "1");
+    cache.set("b", "2");
+    for (let i = 0; i < 3; i++) {
+      cache.get("a");
+      cache.get("b");
+    }
+
+    expect(cache.get("once")).toBeUndefined();
+    cache.set("once", "3");
+    expect(cache.has("once")).toBe(false);
+    expect(cache.has("a")).toBe(true);
+
+    for (let i = 0; i < 3; i++) {
+      cache.get("hot");
+    }
+    cache.set("hot", "4");
+    expect(cache.has("hot")).toBe(true);
+    expect(cache.size).toBe(2);
+  });
+
+  it("evicts least recently used items to stay within a byte budget", () => {
+    const cache = new TTLCache<string, string>({ maxItems: 10, ttlSeconds: 60, maxBytes: 10, sizeOf: (value) => value.length });
+    cache.set("a", "xxxx");
+    cache.set("b", "yyyy");
+    cache.set("c", "zzzz");
+
+    expect(cache.has("a")).toBe(false);
+    expect(cache.has("b")).toBe(true);
+    expect(cache.bytes).toBe(8);
+
+    cache.set("huge", "x".repeat(11));
+    expect(cache.has("huge")).toBe(false);
+    expect(cache.bytes).toBe(8);
+  });
+
+  it("lists live entries with their remaining TTL in LRU order", () => {
+    vi.useFakeTimers();
+    try {
+      const cache = new TTLCache<string, string>({ maxItems: 4, ttlSeconds: 10 });
+      cache.set("expiring", "0", 1);
+      cache.set("a", "1");
+      cache.set("b", "2");
+      cache.get("a");
+      vi.advanceTimersByTime(2000);
+
+      expect(cache.entries()).toEqual([
+        ["b", "2", 8000],
+        ["a", "1", 8000]
+      ]);
+    } finally {
+      vi.useRealTimers();
+    }
+  });
+
+  it("stays within maxItems when filled far past it", () => {
+    const cache = new TTLCache<string, number>({ maxItems: 10, ttlSeconds: 60 });
+    const operations = 1000;
+
+    for (let i = 0; i < operations; i++) {
+      cache.set(`key-${i}`, i);
+    }
+
+    expect(cache.size).toBeLessThanOrEqual(10);
+    expect(cache.get(`key-${operations - 1}`)).toBe(operations - 1);
+    expect(cache.get("key-0")).toBeUndefined();
+    expect(cache.get(`key-${operations - 11}`)).toBeUndefined();
+  });
 });
@@ -0,0 +1,21 @@
+import { describe, expect, it } from "vitest";
+
+import { mapWithConcurrency } from "../src/lib/concurrency.js";
+
+describe("mapWithConcurrency", () => {
+  it("keeps input order and never exceeds the limit", async () => {
+    let inFlight = 0;
+    let peak = 0;
+
+    const results = await mapWithConcurrency([30, 10, 20, 5, 15], 2, async (delay) => {
+      inFlight += 1;
+      peak = Math.max(peak, inFlight);
+      await new Promise((resolve) => setTimeout(resolve, delay));
+      inFlight -= 1;
+      return delay * 2;
+    });
+
+    expect(results).toEqual([60, 20, 40, 10, 30]);
+    expect(peak).toBe(2);
+  });
+});
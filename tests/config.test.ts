@@ -1,6 +1,14 @@
 import { describe, expect, it } from "vitest";
 
-import { envBool, envInt, envIntWithFallback, envStr } from "../src/config.js";
+import {
+  envBool,
+  envInt,
+  envIntWithFallback,
+  envStr,
+  HTTP_TIMEOUT_SECONDS,
+  RIRS,
+  USER_AGENT
+} from "../src/config.js";
 
 describe("env helpers", () => {
   it("parses strings, integers, booleans, and fallbacks like the Python config", () => {
@@ -21,3 +29,19 @@ describe("env helpers", () => {
     expect(envBool("TEST_CONFIG_MISSING_BOOL", true)).toBe(true);
   });
 });
+
+describe("RIR table", () => {
+  it.each(Object.values(RIRS))("describes $label with HTTPS endpoints and its own support flag", (rir) => {
+    expect(rir.supportEnv).toBe(`SUPPORT_${rir.id.toUpperCase()}`);
+    expect(rir.enabled).toBeTypeOf("boolean");
+    expect(rir.whois.server).toBeTruthy();
+    for (const base of [rir.restBase, rir.rdapBase].filter((value) => value !== undefined)) {
+      expect(base).toMatch(/^https:\/\//);
+    }
+  });
+
+  it("has a positive HTTP timeout and a user agent", () => {
+    expect(HTTP_TIMEOUT_SECONDS).toBeGreaterThan(0);
+    expect(USER_AGENT).toBeTruthy();
+  });
+});
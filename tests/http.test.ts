@@ -0,0 +1,41 @@
+import http from "node:http";
+import type { AddressInfo } from "node:net";
+import zlib from "node:zlib";
+
+import { afterEach, describe, expect, it } from "vitest";
+
+import { FetchJsonHttpClient } from "../src/lib/http.js";
+
+let server: http.Server | undefined;
+
+async function listen(handler: http.RequestListener): Promise<string> {
+  server = http.createServer(handler);
+  await new Promise<void>((resolve) => server?.listen(0, "127.0.0.1", resolve));
+  return `http://127.0.0.1:${(server.address() as AddressInfo).port}/`;
+}
+
+afterEach(async () => {
+  await new Promise((resolve) => server?.close(resolve));
+  server = undefined;
+});
+
+describe("FetchJsonHttpClient", () => {
+  it("decodes gzip-compressed JSON", async () => {
+    const url = await listen((_req, res) => {
+      res.writeHead(200, { "Content-Type": "application/json", "Content-Encoding": "gzip" });
+      res.end(zlib.gzipSync(JSON.stringify({ ok: true })));
+    });
+
+    await expect(new FetchJsonHttpClient().getJson(url)).resolves.toEqual({ ok: true });
+  });
+
+  it("rejects when a compressed body is cut off partway through", async () => {
+    const compressed = zlib.gzipSync(JSON.stringify({ padding: "x".repeat(100_000), tail: Math.random() }));
+    const url = await listen((_req, res) => {
+      res.writeHead(200, { "Content-Type": "application/json", "Content-Encoding": "gzip" });
+      res.write(compressed.subarray(0, compressed.length >> 1), () => res.socket?.destroy());
+    });
+
+    await expect(new FetchJsonHttpClient().getJson(url)).rejects.toThrow();
+  });
+});
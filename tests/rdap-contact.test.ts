@@ -155,4 +155,28 @@ describe("RDAP contact tools", () => {
       }
     });
   });
+
+  it("shares one upstream lookup between concurrent identical requests", async () => {
+    const deps = fakeDeps();
+    deps.httpClient.set(`${APNIC_RDAP_BASE}/ip/1.0.0.1/32`, rdapApnic);
+
+    const [first, second] = await Promise.all([
+      handleRdapContact(RIRS.apnic, { ip: "1.0.0.1" }, deps),
+      handleRdapContact(RIRS.apnic, { ip: "1.0.0.1" }, deps)
+    ]);
+
+    expect(second).toBe(first);
+    expect(deps.httpClient.calls.filter((call) => call.url === `${APNIC_RDAP_BASE}/ip/1.0.0.1/32`)).toHaveLength(1);
+  });
+
+  it("rejects malformed IP addresses without an RDAP request", async () => {
+    const deps = fakeDeps();
+
+    await expect(handleRdapContact(RIRS.apnic, { ip: "1.2.3" }, deps)).resolves.toEqual({
+      ok: false,
+      error: "bad_request",
+      detail: "Invalid IP address: '1.2.3'"
+    });
+    expect(deps.httpClient.calls).toHaveLength(0);
+  });
 });
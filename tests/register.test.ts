@@ -54,4 +54,10 @@ describe("registeredToolNames", () => {
       "arin_contact_card"
     ]);
   });
+
+  it("advertises each tool name once", () => {
+    const names = registeredToolNames({ ripe: true, arin: true, apnic: true, afrinic: true, lacnic: true });
+
+    expect(names).toEqual([...new Set(names)]);
+  });
 });
@@ -77,4 +77,77 @@ describe("RIPE contact tool", () => {
       }
     });
   });
+
+  it("remembers contact handles that returned 404 across cards", async () => {
+    const deps = fakeDeps();
+    for (const org of ["ORG-STALE1-RIPE", "ORG-STALE2-RIPE"]) {
+      deps.httpClient.set(
+        `${RIPE_REST_BASE}/ripe/organisation/${org}.json`,
+        ripeObject("organisation", [
+          { name: "org-name", value: org },
+          { name: "admin-c", value: "GONE1-RIPE" }
+        ])
+      );
+    }
+
+    await handleRipeContact({ org: "ORG-STALE1-RIPE" }, deps);
+    const result = await handleRipeContact({ org: "ORG-STALE2-RIPE" }, deps);
+
+    expect(result).toMatchObject({ ok: true, data: { admin_contacts: [] } });
+    const contactCalls = deps.httpClient.calls.filter((call) => call.url.includes("GONE1-RIPE"));
+    expect(contactCalls.map((call) => call.url)).toEqual([
+      `${RIPE_REST_BASE}/ripe/person/GONE1-RIPE.json`,
+      `${RIPE_REST_BASE}/ripe/role/GONE1-RIPE.json`
+    ]);
+  });
+
+  it("reuses person details shared by several organisations", async () => {
+    const deps = fakeDeps();
+    for (const org of ["ORG-SHARED1-RIPE", "ORG-SHARED2-RIPE"]) {
+      deps.httpClient.set(
+        `${RIPE_REST_BASE}/ripe/organisation/${org}.json`,
+        ripeObject("organisation", [
+          { name: "org-name", value: org },
+          { name: "admin-c", value: "STAFF1-RIPE" }
+        ])
+      );
+    }
+    deps.httpClient.set(
+      `${RIPE_REST_BASE}/ripe/person/STAFF1-RIPE.json`,
+      ripeObject("person", [
+        { name: "person", value: "Shared Staff" },
+        { name: "e-mail", value: "staff@example.net" }
+      ])
+    );
+
+    await handleRipeContact({ org: "ORG-SHARED1-RIPE" }, deps);
+    const result = await handleRipeContact({ org: "ORG-SHARED2-RIPE" }, deps);
+
+    expect(result).toMatchObject({
+      ok: true,
+      data: { admin_contacts: [{ handle: "STAFF1-RIPE", person: "Shared Staff", emails: ["staff@example.net"] }] }
+    });
+    expect(deps.httpClient.calls.filter((call) => call.url.includes("STAFF1-RIPE"))).toHaveLength(1);
+  });
+
+  it("fetches a handle listed as both admin-c and tech-c once", async () => {
+    const deps = fakeDeps();
+    deps.httpClient.set(
+      `${RIPE_REST_BASE}/ripe/organisation/ORG-BOTH-RIPE.json`,
+      ripeObject("organisation", [
+        { name: "org-name", value: "Both Roles" },
+        { name: "admin-c", value: "BOTH1-RIPE" },
+        { name: "tech-c", value: "BOTH1-RIPE" }
+      ])
+    );
+    deps.httpClient.set(`${RIPE_REST_BASE}/ripe/person/BOTH1-RIPE.json`, ripeObject("person", [{ name: "person", value: "Both" }]));
+
+    const result = await handleRipeContact({ org: "ORG-BOTH-RIPE" }, deps);
+
+    expect(result).toMatchObject({
+      ok: true,
+      data: { admin_contacts: [{ handle: "BOTH1-RIPE" }], tech_contacts: [{ handle: "BOTH1-RIPE" }] }
+    });
+    expect(deps.httpClient.calls.filter((call) => call.url.includes("BOTH1-RIPE"))).toHaveLength(1);
+  });
 });
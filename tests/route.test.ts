@@ -10,7 +10,7 @@ import ripeRouteSearch from "./fixtures/ripe-route-search.json" with { type: "js
 describe("route validation tools", () => {
   it("finds matching RIPE route objects by prefix and origin ASN", async () => {
     const deps = fakeDeps();
-    deps.httpClient.set(`${RIPE_REST_BASE}/search.json?query-string=192.0.2.0/24&type-filter=route`, ripeRouteSearch);
+    deps.httpClient.set(`${RIPE_REST_BASE}/search.json?query-string=192.0.2.0/24&type-filter=route&flags=no-referenced&flags=no-irt`, ripeRouteSearch);
 
     await expect(handleRipeRoute({ prefix: "192.0.2.0/24", origin_asn: 64496 }, deps)).resolves.toEqual({
       ok: true,
@@ -26,7 +26,7 @@ describe("route validation tools", () => {
   it("maps RIPE 404 responses to not-found", async () => {
     const deps = fakeDeps();
     deps.httpClient.set(
-      `${RIPE_REST_BASE}/search.json?query-string=198.51.100.0/24&type-filter=route`,
+      `${RIPE_REST_BASE}/search.json?query-string=198.51.100.0/24&type-filter=route&flags=no-referenced&flags=no-irt`,
       new HttpStatusError(404, "Not Found", "url")
     );
 
@@ -62,6 +62,20 @@ describe("route validation tools", () => {
     });
   });
 
+  it("matches ARIN origins only when they are a whole ASN", async () => {
+    const deps = fakeDeps();
+    deps.httpClient.set(`${ARIN_REST_BASE}/irr/route/203.0.113.128/25`, {
+      routes: [
+        { prefix: "203.0.113.128/25", originAS: "64497" },
+        { prefix: "203.0.113.128/26", originAS: "AS64497-LEGACY" }
+      ]
+    });
+
+    const result = await handleArinRoute({ prefix: "203.0.113.128/25", origin_asn: 64497 }, deps);
+
+    expect(result).toMatchObject({ ok: true, data: { state: "exists", matches: [{ route: "203.0.113.128/25" }] } });
+  });
+
   it("rejects invalid prefixes before network lookup", async () => {
     const deps = fakeDeps();
     const result = await handleRipeRoute({ prefix: "not-a-prefix", origin_asn: 64496 }, deps);
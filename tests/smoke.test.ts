@@ -0,0 +1,167 @@
+import type { McpServer } from "@modelcontextprotocol/sdk/server/mcp.js";
+import { beforeAll, describe, expect, it } from "vitest";
+
+import { RIRS, type RirId } from "../src/config.js";
+import { registeredToolNames, registerTools } from "../src/register.js";
+import { fakeDeps } from "./helpers.js";
+
+interface RecordedTool {
+  description?: string;
+  inputSchema?: Record<string, unknown>;
+}
+
+// Records registerTool calls instead of building a real McpServer. One registration pass, done once for
+// the whole file, is shared by every test below.
+const registered = new Map<string, RecordedTool>();
+const registrationOrder: string[] = [];
+const rirIds = Object.keys(RIRS) as RirId[];
+const recordingServer = {
+  registerTool(name: string, config: RecordedTool) {
+    registered.set(name, config);
+    registrationOrder.push(name);
+  }
+} as unknown as McpServer;
+
+// Every tool module, the register function it must export, the parameters that function takes and the
+// registries that use it. Modules registered once per registry are exercised with the first enabled one.
+const toolModules: Array<{
+  module: string;
+  load: () => Promise<unknown>;
+  exportName: string;
+  arity: number;
+  rirs?: RirId[];
+}> = [
+  { module: "whois", load: () => import("../src/tools/whois.js"), exportName: "registerWhoisTool", arity: 3, rirs: rirIds },
+  { module: "auth", load: () => import("../src/tools/auth.js"), exportName: "registerAuthTools", arity: 2 },
+  {
+    module: "rdap-contact",
+    load: () => import("../src/tools/rdap-contact.js"),
+    exportName: "registerRdapContactTool",
+    arity: 3,
+    rirs: ["apnic", "afrinic", "lacnic"]
+  },
+  {
+    module: "ripe/as-set",
+    load: () => import("../src/tools/ripe/as-set.js"),
+    exportName: "registerRipeAsSetTool",
+    arity: 2,
+    rirs: ["ripe"]
+  },
+  {
+    module: "ripe/route",
+    load: () => import("../src/tools/ripe/route.js"),
+    exportName: "registerRipeRouteTool",
+    arity: 2,
+    rirs: ["ripe"]
+  },
+  {
+    module: "ripe/contact",
+    load: () => import("../src/tools/ripe/contact.js"),
+    exportName: "registerRipeContactTool",
+    arity: 2,
+    rirs: ["ripe"]
+  },
+  {
+    module: "arin/as-set",
+    load: () => import("../src/tools/arin/as-set.js"),
+    exportName: "registerArinAsSetTool",
+    arity: 2,
+    rirs: ["arin"]
+  },
+  {
+    module: "arin/route",
+    load: () => import("../src/tools/arin/route.js"),
+    exportName: "registerArinRouteTool",
+    arity: 2,
+    rirs: ["arin"]
+  },
+  {
+    module: "arin/contact",
+    load: () => import("../src/tools/arin/contact.js"),
+    exportName: "registerArinContactTool",
+    arity: 2,
+    rirs: ["arin"]
+  }
+];
+
+// The registry a module is exercised with: the first of its registries that is enabled, or null when all of them
+// are disabled. Such modules are skipped rather than imported, matching what registerTools loads.
+function enabledRir({ rirs }: (typeof toolModules)[number]): RirId | null | undefined {
+  return rirs === undefined ? undefined : (rirs.find((rir) => RIRS[rir].enabled) ?? null);
+}
+
+type RegisterFunction = (...args: unknown[]) => void;
+
+async function loadRegister({ load, exportName }: (typeof toolModules)[number]): Promise<unknown> {
+  return ((await load()) as Record<string, unknown>)[exportName];
+}
+
+describe("tool registration smoke test", () => {
+  beforeAll(async () => {
+    await registerTools(recordingServer, fakeDeps());
+  });
+
+  it("registers exactly the advertised tools", () => {
+    expect([...registered.keys()].sort()).toEqual(registeredToolNames().sort());
+  });
+
+  // The map above would silently keep only the last of two tools registered under one name.
+  it("registers each tool name once", () => {
+    // Comparing against the de-duplicated list shows which names clash when this fails.
+    expect(registrationOrder).toEqual([...new Set(registrationOrder)]);
+  });
+
+  it("gives every tool a description and an input schema", () => {
+    for (const [name, tool] of registered) {
+      expect(tool.description, name).toBeTruthy();
+      expect(tool.inputSchema, name).toBeTypeOf("object");
+    }
+  });
+
+  // One parametrised case per registry, so a failure names the RIR whose tools went missing. Disabled
+  // registries are skipped, since registerTools never loads their tools.
+  it.for(rirIds)("registers the %s tools under the registry's prefix", (rir, { skip }) => {
+    skip(!RIRS[rir].enabled, `${rir} is disabled`);
+    const onlyThisRir = Object.fromEntries(rirIds.map((id) => [id, id === rir])) as Record<RirId, boolean>;
+    const rirTools = registeredToolNames(onlyThisRir).filter((name) => name.startsWith(`${rir}_`));
+
+    expect(rirTools.length).toBeGreaterThan(0);
+    for (const name of rirTools) {
+      expect(registered.has(name), name).toBe(true);
+    }
+  });
+
+  it.for(toolModules)("$module exports $exportName", async (toolModule, { skip }) => {
+    skip(enabledRir(toolModule) === null, `${toolModule.rirs?.join(", ")} disabled`);
+    const register = await loadRegister(toolModule);
+
+    expect(register).toBeTypeOf("function");
+    expect((register as RegisterFunction).length).toBe(toolModule.arity);
+  });
+
+  // Each module registers on its own server, so one broken module fails only its own case.
+  it.for(toolModules)("$module registers its tools on a fresh server", async (toolModule, { skip }) => {
+    skip(enabledRir(toolModule) === null, `${toolModule.rirs?.join(", ")} disabled`);
+    const names: string[] = [];
+    const server = {
+      registerTool(name: string) {
+        names.push(name);
+      }
+    } as unknown as McpServer;
+    const register = (await loadRegister(toolModule)) as RegisterFunction;
+    const deps = fakeDeps();
+
+    const rir = enabledRir(toolModule);
+    if (toolModule.arity === 3 && rir) {
+      register(server, RIRS[rir], deps);
+    } else {
+      register(server, deps);
+    }
+
+    const allNames = registeredToolNames(Object.fromEntries(rirIds.map((id) => [id, true])));
+    expect(names.length).toBeGreaterThan(0);
+    for (const name of names) {
+      expect(allNames, name).toContain(name);
+    }
+  });
+});
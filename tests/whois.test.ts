@@ -1,7 +1,7 @@
-import { describe, expect, it } from "vitest";
+import { describe, expect, it, vi } from "vitest";
 
 import { RIRS } from "../src/config.js";
-import { WhoisTimeoutError } from "../src/lib/whois-client.js";
+import { WhoisResponseTooLargeError, WhoisTimeoutError } from "../src/lib/whois-client.js";
 import { handleWhoisQuery } from "../src/tools/whois.js";
 import { fakeDeps } from "./helpers.js";
 
@@ -46,4 +46,98 @@ describe("WHOIS tools", () => {
       detail: "Connection or read timeout"
     });
   });
+
+  it("reports oversized replies without caching them", async () => {
+    const deps = fakeDeps();
+    deps.whoisClient.response = new WhoisResponseTooLargeError(4096);
+
+    const first = await handleWhoisQuery(RIRS.ripe, { query: "AS-HUGE" }, deps);
+    await handleWhoisQuery(RIRS.ripe, { query: "AS-HUGE" }, deps);
+
+    expect(first).toEqual({
+      ok: false,
+      error: "response_too_large",
+      detail: "WHOIS response exceeded 4096 bytes"
+    });
+    expect(deps.whoisClient.calls).toHaveLength(2);
+  });
+
+  it("briefly caches failures so repeated queries do not reconnect", async () => {
+    const deps = fakeDeps();
+    deps.whoisClient.response = new Error("connect ECONNREFUSED");
+
+    const first = await handleWhoisQuery(RIRS.apnic, { query: "AS64511" }, deps);
+    const second = await handleWhoisQuery(RIRS.apnic, { query: "AS64511" }, deps);
+
+    expect(first).toEqual({
+      ok: false,
+      error: "network_error",
+      detail: "Network connection failed: connect ECONNREFUSED"
+    });
+    expect(second).toEqual(first);
+    expect(deps.whoisClient.calls).toHaveLength(1);
+  });
+
+  it("coalesces concurrent identical queries into one connection", async () => {
+    const deps = fakeDeps();
+    deps.whoisClient.response = "aut-num: AS64512\n";
+
+    const results = await Promise.all([
+      handleWhoisQuery(RIRS.ripe, { query: "AS64512" }, deps),
+      handleWhoisQuery(RIRS.ripe, { query: "AS64512" }, deps)
+    ]);
+
+    expect(results[1]).toBe(results[0]);
+    expect(deps.whoisClient.calls).toHaveLength(1);
+  });
+
+  it("keeps ASN replies cached longer than address lookups", async () => {
+    vi.useFakeTimers();
+    try {
+      const deps = fakeDeps();
+      await handleWhoisQuery(RIRS.apnic, { query: "AS64520" }, deps);
+      await handleWhoisQuery(RIRS.apnic, { query: "192.0.2.55" }, deps);
+      vi.advanceTimersByTime(301_000);
+      await handleWhoisQuery(RIRS.apnic, { query: "AS64520" }, deps);
+      await handleWhoisQuery(RIRS.apnic, { query: "192.0.2.55" }, deps);
+
+      expect(deps.whoisClient.calls.map((call) => call.line)).toEqual(["AS64520\r\n", "192.0.2.55\r\n", "192.0.2.55\r\n"]);
+    } finally {
+      vi.useRealTimers();
+    }
+  });
+
+  it("keeps handle replies longer but treats dashed numeric ranges like other queries", async () => {
+    vi.useFakeTimers();
+    try {
+      const deps = fakeDeps();
+      await handleWhoisQuery(RIRS.apnic, { query: "EXAMPLE-AP" }, deps);
+      await handleWhoisQuery(RIRS.apnic, { query: "64496-64511" }, deps);
+      vi.advanceTimersByTime(301_000);
+      await handleWhoisQuery(RIRS.apnic, { query: "EXAMPLE-AP" }, deps);
+      await handleWhoisQuery(RIRS.apnic, { query: "64496-64511" }, deps);
+
+      expect(deps.whoisClient.calls.map((call) => call.line)).toEqual([
+        "EXAMPLE-AP\r\n",
+        "64496-64511\r\n",
+        "64496-64511\r\n"
+      ]);
+    } finally {
+      vi.useRealTimers();
+    }
+  });
+
+  it("keeps the default TTL for flagged inverse lookups of an ASN", async () => {
+    vi.useFakeTimers();
+    try {
+      const deps = fakeDeps();
+      await handleWhoisQuery(RIRS.apnic, { query: "AS64530", flags: ["-i", "origin"] }, deps);
+      vi.advanceTimersByTime(301_000);
+      await handleWhoisQuery(RIRS.apnic, { query: "AS64530", flags: ["-i", "origin"] }, deps);
+
+      expect(deps.whoisClient.calls.map((call) => call.line)).toEqual(["-i origin AS64530\r\n", "-i origin AS64530\r\n"]);
+    } finally {
+      vi.useRealTimers();
+    }
+  });
 });